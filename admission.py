@@ -0,0 +1,308 @@
+"""
+Heart Disease Prediction - Admission Control
+Author: Your Name
+Date: 2026
+Description: Concurrency limits, bounded wait queues and per-client token
+buckets in front of the API. Requests that would wait longer than a lane's
+latency target are shed at once with 503 + Retry-After instead of piling up
+inside the worker; with HEARTGUARD_CLIENT_RATE set, clients over their rate
+get 429 + Retry-After.
+
+Lanes and buckets live in each worker process, so the limits apply per
+worker. Shedding needs a worker that runs requests concurrently: gunicorn's
+gthread workers (see Procfile) or asgi:app. A sync worker handles one
+request at a time, so its lanes never fill and excess requests queue in
+gunicorn's backlog instead.
+"""
+
+import asyncio
+import math
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from functools import wraps
+
+from flask import jsonify, request
+
+# ==================== CONFIGURATION ====================
+
+def _env_int(name, default):
+    return int(os.environ.get(name, default))
+
+def _env_float(name, default):
+    return float(os.environ.get(name, default))
+
+# Per-client token bucket for /api/predict: sustained rate and burst size.
+# Off by default (rate 0): behind a proxy every client shares the proxy's
+# address until HEARTGUARD_TRUSTED_PROXIES is set, so enable the two together.
+CLIENT_RATE = _env_float('HEARTGUARD_CLIENT_RATE', '0')
+CLIENT_BURST = _env_float('HEARTGUARD_CLIENT_BURST', '10')
+# Clients remembered by the token bucket before the oldest are forgotten
+MAX_CLIENTS = _env_int('HEARTGUARD_MAX_CLIENTS', '10000')
+# Reverse proxies in front of the app that append to X-Forwarded-For (1 on
+# Heroku). The client address is the entry the outermost trusted proxy
+# appended; anything to its left is client-supplied and ignored.
+TRUSTED_PROXIES = _env_int('HEARTGUARD_TRUSTED_PROXIES', '0')
+
+# ==================== LANES ====================
+
+class Lane:
+    """A concurrency limit with a bounded wait queue and a latency target"""
+
+    def __init__(self, name, concurrency, queue_size, target_ms, yield_to=None):
+        self.name = name
+        self.concurrency = concurrency
+        self.queue_size = queue_size
+        self.target = target_ms / 1000.0
+        # Lower-priority lanes shed load while this lane has a queue
+        self.yield_to = yield_to
+
+        self._lock = threading.Lock()
+        self._cond = threading.Condition(self._lock)
+        self._async_waiters = deque()
+        self.active = 0
+        self.waiting = 0
+        # Moving average of how long an admitted request holds its slot
+        self.service_time = 0.05
+        self.admitted = 0
+        self.shed = 0
+
+    def _estimated_wait(self):
+        """Expected queueing delay for a request arriving now"""
+        ahead = self.active + self.waiting - self.concurrency + 1
+        if ahead <= 0:
+            return 0.0
+        return math.ceil(ahead / self.concurrency) * self.service_time
+
+    def _rejection(self):
+        """Return a Retry-After in seconds if a new request must be shed"""
+        if self.yield_to is not None and self.yield_to.waiting > 0:
+            return max(1, math.ceil(self.yield_to._estimated_wait()))
+        if self.active < self.concurrency:
+            return None
+        wait = self._estimated_wait()
+        if self.waiting >= self.queue_size or wait > self.target:
+            return max(1, math.ceil(wait))
+        return None
+
+    def acquire(self):
+        """
+        Take a slot, waiting at most the latency target
+        Returns: (start_time, None) when admitted, (None, retry_after) when shed
+        """
+        with self._lock:
+            retry_after = self._rejection()
+            if retry_after is not None:
+                self.shed += 1
+                return None, retry_after
+
+            deadline = time.monotonic() + self.target
+            self.waiting += 1
+            try:
+                while self.active >= self.concurrency:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0 or not self._cond.wait(remaining):
+                        if self.active >= self.concurrency:
+                            self.shed += 1
+                            return None, max(1, math.ceil(self._estimated_wait()))
+            finally:
+                self.waiting -= 1
+
+            self.active += 1
+            self.admitted += 1
+            return time.monotonic(), None
+
+    async def acquire_async(self):
+        """Awaitable twin of acquire() for the asyncio front end"""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            retry_after = self._rejection()
+            if retry_after is not None:
+                self.shed += 1
+                return None, retry_after
+            if self.active < self.concurrency:
+                self.active += 1
+                self.admitted += 1
+                return time.monotonic(), None
+            waiter = loop.create_future()
+            self._async_waiters.append((loop, waiter))
+            self.waiting += 1
+
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter), self.target)
+        except asyncio.TimeoutError:
+            with self._lock:
+                if not waiter.done():
+                    # Not handed a slot yet, so give up our place in the queue
+                    self._async_waiters.remove((loop, waiter))
+                    self.waiting -= 1
+                    self.shed += 1
+                    return None, max(1, math.ceil(self._estimated_wait()))
+        except asyncio.CancelledError:
+            with self._lock:
+                handed_slot = waiter.done()
+                if not handed_slot:
+                    self._async_waiters.remove((loop, waiter))
+                    self.waiting -= 1
+            if handed_slot:
+                self.release(time.monotonic())
+            raise
+        return time.monotonic(), None
+
+    def release(self, started):
+        """Return a slot and hand it straight to the next waiter"""
+        elapsed = time.monotonic() - started
+        with self._lock:
+            self.service_time = 0.9 * self.service_time + 0.1 * elapsed
+            if self._async_waiters:
+                loop, waiter = self._async_waiters.popleft()
+                self.waiting -= 1
+                self.admitted += 1
+                loop.call_soon_threadsafe(_wake, waiter)
+                return
+            self.active -= 1
+            self._cond.notify()
+
+    def snapshot(self):
+        """Lane state for the metrics endpoint"""
+        return {
+            'concurrency': self.concurrency,
+            'queue_size': self.queue_size,
+            'target_ms': round(self.target * 1000),
+            'active': self.active,
+            'waiting': self.waiting,
+            'service_time_ms': round(self.service_time * 1000, 2),
+            'admitted': self.admitted,
+            'shed': self.shed,
+        }
+
+def _wake(waiter):
+    if not waiter.done():
+        waiter.set_result(None)
+
+# ==================== TOKEN BUCKET ====================
+
+class TokenBucket:
+    """Per-client token bucket, keyed on client IP"""
+
+    def __init__(self, rate, burst, max_clients):
+        self.rate = rate
+        self.burst = burst
+        self.max_clients = max_clients
+        self._clients = OrderedDict()
+        self._lock = threading.Lock()
+        self.limited = 0
+
+    @property
+    def enabled(self):
+        return self.rate > 0
+
+    def take(self, key):
+        """Spend one token; return None if allowed, else Retry-After seconds"""
+        now = time.monotonic()
+        with self._lock:
+            tokens, last = self._clients.pop(key, (self.burst, now))
+            tokens = min(self.burst, tokens + (now - last) * self.rate)
+            if tokens >= 1:
+                tokens -= 1
+                retry_after = None
+            else:
+                self.limited += 1
+                retry_after = max(1, math.ceil((1 - tokens) / self.rate))
+            self._clients[key] = (tokens, now)
+            while len(self._clients) > self.max_clients:
+                self._clients.popitem(last=False)
+            return retry_after
+
+    def snapshot(self):
+        return {
+            'enabled': self.enabled,
+            'rate': self.rate,
+            'burst': self.burst,
+            'clients': len(self._clients),
+            'limited': self.limited,
+        }
+
+PREDICT_LANE = Lane(
+    'predict',
+    concurrency=_env_int('HEARTGUARD_PREDICT_CONCURRENCY', '4'),
+    queue_size=_env_int('HEARTGUARD_PREDICT_QUEUE', '32'),
+    target_ms=_env_float('HEARTGUARD_PREDICT_TARGET_MS', '2000'),
+)
+HISTORY_LANE = Lane(
+    'history',
+    concurrency=_env_int('HEARTGUARD_HISTORY_CONCURRENCY', '2'),
+    queue_size=_env_int('HEARTGUARD_HISTORY_QUEUE', '8'),
+    target_ms=_env_float('HEARTGUARD_HISTORY_TARGET_MS', '1000'),
+    yield_to=PREDICT_LANE,
+)
+CONTENT_LANE = Lane(
+    'content',
+    concurrency=_env_int('HEARTGUARD_CONTENT_CONCURRENCY', '2'),
+    queue_size=_env_int('HEARTGUARD_CONTENT_QUEUE', '16'),
+    target_ms=_env_float('HEARTGUARD_CONTENT_TARGET_MS', '500'),
+    yield_to=PREDICT_LANE,
+)
+CLIENT_BUCKET = TokenBucket(CLIENT_RATE, CLIENT_BURST, MAX_CLIENTS)
+
+# ==================== FLASK INTEGRATION ====================
+
+def client_address(remote_addr, forwarded_for):
+    """
+    Client IP for rate limiting, trusting only the last TRUSTED_PROXIES
+    X-Forwarded-For hops, as werkzeug's ProxyFix does
+    """
+    if TRUSTED_PROXIES <= 0 or not forwarded_for:
+        return remote_addr
+    hops = [hop.strip() for hop in forwarded_for.split(',')]
+    if len(hops) < TRUSTED_PROXIES:
+        return remote_addr
+    return hops[-TRUSTED_PROXIES]
+
+def client_key(address):
+    """
+    Token bucket key: the client address. Not the session user, since
+    /api/login accepts any username and a fresh name would get a fresh burst.
+    """
+    return f'ip:{address}'
+
+def rejection_body(status):
+    """Error body for a shed or rate-limited request"""
+    if status == 429:
+        return {'error': 'Too many requests. Please slow down.'}
+    return {'error': 'Server busy. Please retry shortly.'}
+
+def _reject(status, retry_after):
+    response = jsonify(rejection_body(status))
+    response.status_code = status
+    response.headers['Retry-After'] = str(retry_after)
+    return response
+
+def admit(lane, rate_limited=False):
+    """Run a Flask view under a lane, optionally behind the client token bucket"""
+    def decorator(view):
+        @wraps(view)
+        def wrapped(*args, **kwargs):
+            if rate_limited and CLIENT_BUCKET.enabled:
+                address = client_address(request.remote_addr, request.headers.get('X-Forwarded-For'))
+                retry_after = CLIENT_BUCKET.take(client_key(address))
+                if retry_after is not None:
+                    return _reject(429, retry_after)
+
+            started, retry_after = lane.acquire()
+            if started is None:
+                return _reject(503, retry_after)
+            try:
+                return view(*args, **kwargs)
+            finally:
+                lane.release(started)
+        return wrapped
+    return decorator
+
+def snapshot():
+    """Admission state for the metrics endpoint"""
+    return {
+        'lanes': {lane.name: lane.snapshot() for lane in (PREDICT_LANE, HISTORY_LANE, CONTENT_LANE)},
+        'client_bucket': CLIENT_BUCKET.snapshot(),
+    }
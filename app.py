@@ -1,13 +1,22 @@
-
 from flask import Flask, render_template, request, jsonify, session
 import json
-import sqlite3
 import joblib
 import numpy as np
 from datetime import datetime
 import os
+import time
 from pathlib import Path
 
+import admission
+import drift
+import fanout
+import knn_index
+import precision
+import shadow
+import storage
+import thread_budget
+from schema import FEATURES, MODEL_NAMES
+
 # Print environment info for debugging
 import sklearn
 import numpy
@@ -43,62 +52,28 @@ DATABASE_PATH.parent.mkdir(exist_ok=True)
 # ==================== DATABASE INITIALIZATION ====================
 
 def init_database():
-    """Initialize SQLite database"""
-    if not DATABASE_PATH.exists():
-        conn = sqlite3.connect(DATABASE_PATH)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            CREATE TABLE predictions (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                age INTEGER,
-                sex INTEGER,
-                chest_pain_type INTEGER,
-                resting_blood_pressure INTEGER,
-                cholesterol INTEGER,
-                fasting_blood_sugar INTEGER,
-                resting_ecg INTEGER,
-                max_heart_rate INTEGER,
-                exercise_induced_angina INTEGER,
-                st_depression REAL,
-                st_slope INTEGER,
-                major_vessels INTEGER,
-                thalassemia INTEGER,
-                risk_percentage REAL,
-                risk_level TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
-        
-        conn.commit()
-        conn.close()
-        print("[OK] Database initialized successfully")
+    """Initialize SQLite database (time-partitioned, see storage.py)"""
+    storage.init_storage(DATABASE_PATH)
+    print("[OK] Database initialized successfully")
 
 # Initialize database at startup
 init_database()
 
 # ==================== MODEL LOADING ====================
 
-def load_models():
+def load_models(models_dir=MODELS_DIR):
     """Load all trained ML models"""
     try:
         models = {}
         
         # Check which models exist and load them
-        model_files = {
-            'knn': 'knn.pkl',
-            'decision_tree': 'decision_tree.pkl',
-            'naive_bayes': 'naive_bayes.pkl',
-            'svm': 'svm.pkl',
-            'logistic_regression': 'logistic_regression.pkl',
-            'mlp': 'mlp.pkl'
-        }
+        model_files = {name: f'{name}.pkl' for name in MODEL_NAMES}
         
         # Track loaded models
         loaded_count = 0
         
         for model_name, filename in model_files.items():
-            filepath = MODELS_DIR / filename
+            filepath = models_dir / filename
             if filepath.exists():
                 models[model_name] = joblib.load(filepath)
                 print(f"[OK] Loaded {model_name}: {filename}")
@@ -106,8 +81,12 @@ def load_models():
             else:
                 print(f"[WARNING] Warning: {filename} not found")
         
+        # knn.pkl carries its fitted tree; report how it compared to brute force
+        if 'knn' in models:
+            knn_index.load_report(models_dir)
+        
         # Try to load scaler
-        scaler_path = MODELS_DIR / 'scaler.pkl'
+        scaler_path = models_dir / 'scaler.pkl'
         if scaler_path.exists():
             models['scaler'] = joblib.load(scaler_path)
             print(f"[OK] Loaded scaler: scaler.pkl")
@@ -117,7 +96,7 @@ def load_models():
             models['scaler'] = StandardScaler()
         
         # Try to load feature names
-        feature_names_path = MODELS_DIR / 'feature_names.pkl'
+        feature_names_path = models_dir / 'feature_names.pkl'
         if feature_names_path.exists():
             models['feature_names'] = joblib.load(feature_names_path)
             print(f"[OK] Loaded feature names: feature_names.pkl")
@@ -138,6 +117,16 @@ def load_models():
 # Load models at startup
 MODELS = load_models()
 
+# Optional float32 inference mode, plus the per-model memory report
+if MODELS:
+    MODELS = precision.prepare_models(MODELS, BASE_DIR / 'data' / 'heart.csv')
+
+# Reference statistics for the input drift monitor
+drift.set_reference(drift.load_reference(MODELS_DIR))
+
+# Keep numpy/sklearn thread pools within this worker's share of the host
+thread_budget.apply_worker_budget()
+
 # ==================== HEALTH RECOMMENDATIONS ====================
 
 def get_precautions(risk_level):
@@ -299,6 +288,114 @@ def calculate_risk_level(disease_votes, total_models):
     
     return risk_level, percentage
 
+# ==================== PREDICTION PIPELINE ====================
+
+def has_required_fields(data):
+    """Check that a request payload carries every model input"""
+    return all(field in data for field in FEATURES)
+
+def extract_features(data):
+    """Build the model input row from a request payload"""
+    # Convert to numpy array for consistent model input
+    return np.array([[data[field] for field in FEATURES]])
+
+def scale_features(features):
+    """Scale features if scaler available"""
+    try:
+        if 'scaler' in MODELS:
+            return MODELS['scaler'].transform(features)
+        return features
+    except Exception as e:
+        print(f"[WARNING] Scaling failed: {e}")
+        return features
+
+def predict_sequential(scaled_features):
+    """Evaluate the models one after another"""
+    # Get predictions from all available models
+    # Using numpy arrays to avoid sklearn feature name warnings
+    predictions = {}
+    
+    if 'knn' in MODELS:
+        predictions['knn'] = int(MODELS['knn'].predict(scaled_features)[0])
+    
+    if 'decision_tree' in MODELS:
+        predictions['decision_tree'] = int(MODELS['decision_tree'].predict(scaled_features)[0])
+    
+    if 'naive_bayes' in MODELS:
+        predictions['naive_bayes'] = int(MODELS['naive_bayes'].predict(scaled_features)[0])
+    
+    if 'svm' in MODELS:
+        predictions['svm'] = int(MODELS['svm'].predict(scaled_features)[0])
+    
+    if 'logistic_regression' in MODELS:
+        predictions['logistic_regression'] = int(MODELS['logistic_regression'].predict(scaled_features)[0])
+    
+    if 'mlp' in MODELS:
+        predictions['mlp'] = int(MODELS['mlp'].predict(scaled_features)[0])
+    
+    return predictions
+
+def run_ensemble(data):
+    """
+    Score one patient record with every loaded model
+    Returns: (risk_level, risk_percentage, skipped_models), or None if no
+    model is available; skipped_models is None unless fan-out mode is on
+    """
+    features = extract_features(data)
+    scaled_features = scale_features(features)
+    
+    started = time.perf_counter()
+    
+    if fanout.ENABLED:
+        predictions, skipped = fanout.predict_all(MODELS, MODEL_NAMES, scaled_features)
+    else:
+        predictions, skipped = predict_sequential(scaled_features), None
+    
+    live_seconds = time.perf_counter() - started
+    
+    if not predictions:
+        return None
+    
+    drift.observe(features, predictions)
+    
+    # Ensemble voting
+    num_models = len(predictions)
+    disease_votes = sum(predictions.values())
+    
+    # Calculate risk level and percentage
+    risk_level, risk_percentage = calculate_risk_level(disease_votes, num_models)
+    
+    # Copy the request to the shadow candidate, if any, off the response path
+    shadow.submit(features, predictions, risk_level, live_seconds)
+    
+    return risk_level, risk_percentage, skipped
+
+def build_prediction_response(risk_level, risk_percentage, skipped_models=None):
+    """Build the /api/predict response body for a scored record"""
+    # Get precautions and diet plan
+    precautions = get_precautions(risk_level)
+    diet_plan = get_diet_plan(risk_level)
+    
+    response = {
+        'timestamp': datetime.now().isoformat(),
+        'risk_percentage': round(risk_percentage, 1),
+        'risk_level': risk_level,
+        'diagnosis': 'Heart Disease Risk Detected' if risk_percentage >= 50 else 'Low Heart Disease Risk',
+        'precautions': precautions,
+        'diet_plan': diet_plan,
+        'message': f'Risk of Heart Disease: {risk_percentage:.1f}%'
+    }
+    
+    # Fan-out mode reports models that timed out and were left out of the vote
+    if skipped_models is not None:
+        response['skipped_models'] = skipped_models
+    
+    return response
+
+# Shadow-evaluate a candidate model set against live traffic
+if shadow.SHADOW_DIR:
+    shadow.start(load_models(Path(shadow.SHADOW_DIR)), calculate_risk_level)
+
 # ==================== ROUTES ====================
 
 @app.route('/')
@@ -307,6 +404,7 @@ def index():
     return render_template('index.html')
 
 @app.route('/api/predict', methods=['POST'])
+@admission.admit(admission.PREDICT_LANE, rate_limited=True)
 def predict():
     """
     Make a prediction based on patient data
@@ -318,105 +416,28 @@ def predict():
         
         data = request.json
         
-        # Validate input
-        required_fields = [
-            'age', 'sex', 'chest_pain_type', 'resting_blood_pressure',
-            'cholesterol', 'fasting_blood_sugar', 'resting_ecg',
-            'max_heart_rate', 'exercise_induced_angina', 'st_depression',
-            'st_slope', 'major_vessels', 'thalassemia'
-        ]
-        
-        if not all(field in data for field in required_fields):
+        if not has_required_fields(data):
             return jsonify({'error': 'Missing required fields'}), 400
         
-        # Prepare feature array
-        input_data = [
-            data['age'],
-            data['sex'],
-            data['chest_pain_type'],
-            data['resting_blood_pressure'],
-            data['cholesterol'],
-            data['fasting_blood_sugar'],
-            data['resting_ecg'],
-            data['max_heart_rate'],
-            data['exercise_induced_angina'],
-            data['st_depression'],
-            data['st_slope'],
-            data['major_vessels'],
-            data['thalassemia']
-        ]
-        
-        # Convert to numpy array for consistent model input
-        features = np.array([input_data])
-        
-        # Scale features if scaler available
-        try:
-            if 'scaler' in MODELS:
-                scaled_features = MODELS['scaler'].transform(features)
-            else:
-                scaled_features = features
-        except Exception as e:
-            print(f"[WARNING] Scaling failed: {e}")
-            scaled_features = features
-        
-        # Get predictions from all available models
-        # Using numpy arrays to avoid sklearn feature name warnings
-        predictions = {}
-        
-        if 'knn' in MODELS:
-            predictions['knn'] = int(MODELS['knn'].predict(scaled_features)[0])
-        
-        if 'decision_tree' in MODELS:
-            predictions['decision_tree'] = int(MODELS['decision_tree'].predict(scaled_features)[0])
-        
-        if 'naive_bayes' in MODELS:
-            predictions['naive_bayes'] = int(MODELS['naive_bayes'].predict(scaled_features)[0])
-        
-        if 'svm' in MODELS:
-            predictions['svm'] = int(MODELS['svm'].predict(scaled_features)[0])
-        
-        if 'logistic_regression' in MODELS:
-            predictions['logistic_regression'] = int(MODELS['logistic_regression'].predict(scaled_features)[0])
-        
-        if 'mlp' in MODELS:
-            predictions['mlp'] = int(MODELS['mlp'].predict(scaled_features)[0])
+        outcome = run_ensemble(data)
         
         # If no models loaded, return error
-        if not predictions:
+        if outcome is None:
             return jsonify({'error': 'No models available for prediction'}), 500
         
-        # Ensemble voting
-        num_models = len(predictions)
-        disease_votes = sum(predictions.values())
-        
-        # Calculate risk level and percentage
-        risk_level, risk_percentage = calculate_risk_level(disease_votes, num_models)
-        
-        # Get precautions and diet plan
-        precautions = get_precautions(risk_level)
-        diet_plan = get_diet_plan(risk_level)
+        risk_level, risk_percentage, skipped_models = outcome
         
         # Save to database
-        save_prediction(data, risk_percentage, risk_level)
+        save_prediction(data, risk_percentage, risk_level, session.get('user'))
         
-        # Prepare response
-        response = {
-            'timestamp': datetime.now().isoformat(),
-            'risk_percentage': round(risk_percentage, 1),
-            'risk_level': risk_level,
-            'diagnosis': 'Heart Disease Risk Detected' if risk_percentage >= 50 else 'Low Heart Disease Risk',
-            'precautions': precautions,
-            'diet_plan': diet_plan,
-            'message': f'Risk of Heart Disease: {risk_percentage:.1f}%'
-        }
-        
-        return jsonify(response), 200
+        return jsonify(build_prediction_response(risk_level, risk_percentage, skipped_models)), 200
     
     except Exception as e:
         print(f"Error in prediction: {str(e)}")
         return jsonify({'error': str(e)}), 500
 
 @app.route('/api/get-content', methods=['GET'])
+@admission.admit(admission.CONTENT_LANE)
 def get_content():
     """Get precautions and diet plan for a specific risk level"""
     risk_level = request.args.get('risk_level')
@@ -429,21 +450,11 @@ def get_content():
     }), 200
 
 @app.route('/api/history', methods=['GET'])
+@admission.admit(admission.HISTORY_LANE)
 def get_history():
     """Get prediction history from database"""
     try:
-        conn = sqlite3.connect(DATABASE_PATH)
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
-        
-        cursor.execute('SELECT * FROM predictions ORDER BY created_at DESC LIMIT 100')
-        rows = cursor.fetchall()
-        
-        history = [dict(row) for row in rows]
-        
-        conn.close()
-        
-        return jsonify({'history': history}), 200
+        return jsonify({'history': fetch_history()}), 200
     
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -488,6 +499,28 @@ def api_logout():
 def api_auth_status():
     return jsonify({'logged_in': bool(session.get('logged_in')), 'user': session.get('user')}), 200
 
+@app.route('/api/metrics', methods=['GET'])
+def api_metrics():
+    """Runtime metrics for this worker"""
+    return jsonify({
+        'thread_budget': thread_budget.snapshot(),
+        'admission': admission.snapshot(),
+        'drift': drift.summary(),
+        'precision': precision.snapshot(),
+        'shadow': shadow.summary(),
+        'fanout': fanout.snapshot()
+    }), 200
+
+@app.route('/api/drift', methods=['GET'])
+def api_drift():
+    """Live input and vote statistics compared against the training data"""
+    return jsonify(drift.report()), 200
+
+@app.route('/api/shadow', methods=['GET'])
+def api_shadow():
+    """Candidate model agreement with live predictions"""
+    return jsonify(shadow.report()), 200
+
 @app.route('/api/clear-history', methods=['POST'])
 def clear_history():
     """Clear all prediction history"""
@@ -496,15 +529,7 @@ def clear_history():
         if not session.get('logged_in'):
             return jsonify({'error': 'Unauthorized'}), 401
 
-        conn = sqlite3.connect(DATABASE_PATH)
-        cursor = conn.cursor()
-
-        cursor.execute('DELETE FROM predictions')
-        conn.commit()
-
-        count = cursor.rowcount
-
-        conn.close()
+        count = delete_predictions()
 
         return jsonify({'message': f'Cleared {count} predictions'}), 200
     
@@ -513,37 +538,24 @@ def clear_history():
 
 # ==================== DATABASE HELPER FUNCTIONS ====================
 
-def save_prediction(data, risk_percentage, risk_level):
+def save_prediction(data, risk_percentage, risk_level, user=None):
     """Save prediction to database"""
     try:
-        conn = sqlite3.connect(DATABASE_PATH)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            INSERT INTO predictions (
-                age, sex, chest_pain_type, resting_blood_pressure,
-                cholesterol, fasting_blood_sugar, resting_ecg,
-                max_heart_rate, exercise_induced_angina, st_depression,
-                st_slope, major_vessels, thalassemia,
-                risk_percentage, risk_level, created_at
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        ''', (
-            data['age'], data['sex'], data['chest_pain_type'],
-            data['resting_blood_pressure'], data['cholesterol'],
-            data['fasting_blood_sugar'], data['resting_ecg'],
-            data['max_heart_rate'], data['exercise_induced_angina'],
-            data['st_depression'], data['st_slope'],
-            data['major_vessels'], data['thalassemia'],
-            risk_percentage, risk_level, datetime.now().isoformat()
-        ))
-        
-        conn.commit()
-        conn.close()
+        values = [data[field] for field in FEATURES] + [risk_percentage, risk_level]
+        storage.insert_prediction(DATABASE_PATH, values, datetime.now().isoformat(), user)
         print(f"[OK] Prediction saved: Risk Level = {risk_level}, Risk % = {risk_percentage}%")
         
     except Exception as e:
         print(f"Error saving prediction: {str(e)}")
 
+def fetch_history(limit=100):
+    """Fetch the most recent predictions as dicts"""
+    return storage.fetch_recent(DATABASE_PATH, limit)
+
+def delete_predictions():
+    """Delete all stored predictions and return how many were removed"""
+    return storage.clear_all(DATABASE_PATH)
+
 # ==================== ERROR HANDLERS ====================
 
 @app.errorhandler(404)
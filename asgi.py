@@ -0,0 +1,262 @@
+"""
+Heart Disease Prediction - ASGI Serving Entry Point
+Author: Your Name
+Date: 2026
+Description: asyncio front end for the Flask app. The hot API routes are
+served natively: request bodies and database I/O are awaited, and ensemble
+inference runs on a bounded thread pool, so many idle polling connections
+share a few workers. Every other route falls through to the Flask app.
+
+Run: uvicorn asgi:app --workers 2
+ or: gunicorn asgi:app -k uvicorn.workers.UvicornWorker
+"""
+
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+from http.cookies import SimpleCookie
+from urllib.parse import parse_qs
+
+from a2wsgi import WSGIMiddleware
+from itsdangerous import BadSignature
+from werkzeug.exceptions import BadRequest, UnsupportedMediaType
+from werkzeug.http import parse_options_header
+
+import admission
+import app as flask_app
+from app import app as wsgi_app
+
+# ==================== CONFIGURATION ====================
+
+# Threads running model inference, and how many requests may wait for one
+INFERENCE_WORKERS = int(os.environ.get('HEARTGUARD_INFERENCE_WORKERS', '2'))
+INFERENCE_QUEUE = int(os.environ.get('HEARTGUARD_INFERENCE_QUEUE', '64'))
+# Threads running blocking SQLite calls
+DB_WORKERS = int(os.environ.get('HEARTGUARD_DB_WORKERS', '4'))
+# Threads running Flask for the routes not served natively
+FALLBACK_WORKERS = int(os.environ.get('HEARTGUARD_FALLBACK_WORKERS', '8'))
+
+inference_executor = ThreadPoolExecutor(
+    max_workers=INFERENCE_WORKERS, thread_name_prefix='heartguard-inference'
+)
+db_executor = ThreadPoolExecutor(max_workers=DB_WORKERS, thread_name_prefix='heartguard-db')
+
+# Created lazily so it binds to the running event loop
+_inference_slots = None
+
+# Routes not served natively are bridged to Flask on a pool of
+# FALLBACK_WORKERS threads, so they run concurrently like under gthread
+fallback = WSGIMiddleware(wsgi_app, workers=FALLBACK_WORKERS)
+
+# ==================== HELPERS ====================
+
+async def read_body(receive):
+    """Await the full request body"""
+    body = b''
+    more_body = True
+    while more_body:
+        message = await receive()
+        body += message.get('body', b'')
+        more_body = message.get('more_body', False)
+    return body
+
+def get_header(scope, name):
+    """Return a request header value as str, or None"""
+    name = name.lower().encode('latin-1')
+    for key, value in scope['headers']:
+        if key == name:
+            return value.decode('latin-1')
+    return None
+
+def load_json(scope, body):
+    """Parse a JSON body with the same checks and errors as Flask's request.json"""
+    mimetype = parse_options_header(get_header(scope, 'content-type') or '')[0].lower()
+    if not (mimetype == 'application/json' or
+            (mimetype.startswith('application/') and mimetype.endswith('+json'))):
+        raise UnsupportedMediaType(
+            "Did not attempt to load JSON data because the request Content-Type was not 'application/json'."
+        )
+    try:
+        return wsgi_app.json.loads(body)
+    except ValueError as e:
+        if wsgi_app.debug:
+            raise BadRequest(f'Failed to decode JSON object: {e}')
+        raise BadRequest()
+
+def load_session(scope):
+    """Decode the Flask session cookie exactly as the WSGI app would"""
+    cookie_header = get_header(scope, 'cookie')
+    if not cookie_header:
+        return {}
+    cookie = SimpleCookie()
+    cookie.load(cookie_header)
+    morsel = cookie.get(wsgi_app.config['SESSION_COOKIE_NAME'])
+    if morsel is None:
+        return {}
+    serializer = wsgi_app.session_interface.get_signing_serializer(wsgi_app)
+    if serializer is None:
+        return {}
+    max_age = int(wsgi_app.permanent_session_lifetime.total_seconds())
+    try:
+        return serializer.loads(morsel.value, max_age=max_age)
+    except BadSignature:
+        return {}
+
+def client_address(scope):
+    """Client IP, trusting X-Forwarded-For only as far as the Flask side does"""
+    client = scope.get('client')
+    return admission.client_address(client[0] if client else None, get_header(scope, 'x-forwarded-for'))
+
+async def send_json(send, payload, status=200, extra_headers=None):
+    """Send a JSON response rendered by Flask's own JSON provider"""
+    with wsgi_app.app_context():
+        response = wsgi_app.json.response(payload)
+    body = response.get_data()
+    headers = [
+        (b'content-type', response.content_type.encode('latin-1')),
+        (b'content-length', str(len(body)).encode('latin-1')),
+    ]
+    for name, value in (extra_headers or {}).items():
+        headers.append((name.lower().encode('latin-1'), str(value).encode('latin-1')))
+    await send({'type': 'http.response.start', 'status': status, 'headers': headers})
+    await send({'type': 'http.response.body', 'body': body})
+
+async def run_inference(func, *args):
+    """Run blocking model code on the inference pool, bounding the wait queue"""
+    global _inference_slots
+    if _inference_slots is None:
+        _inference_slots = asyncio.Semaphore(INFERENCE_WORKERS + INFERENCE_QUEUE)
+    loop = asyncio.get_running_loop()
+    async with _inference_slots:
+        return await loop.run_in_executor(inference_executor, func, *args)
+
+async def run_db(func, *args):
+    """Run a blocking database call on the database pool"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(db_executor, func, *args)
+
+def vary_cookie(send):
+    """Wrap send to add Vary: Cookie, as Flask does once the session is read"""
+    async def wrapped(message):
+        if message['type'] == 'http.response.start':
+            message = dict(message, headers=list(message['headers']) + [(b'vary', b'Cookie')])
+        await send(message)
+    return wrapped
+
+def admit(lane, rate_limited=False):
+    """
+    Run a handler under an admission lane, as admission.admit does for Flask.
+    The body is read before a slot is taken, so a slow upload never holds
+    one; handlers receive it in place of `receive`.
+    """
+    def decorator(handler):
+        async def wrapped(scope, receive, send):
+            body = await read_body(receive)
+            if rate_limited and admission.CLIENT_BUCKET.enabled:
+                retry_after = admission.CLIENT_BUCKET.take(admission.client_key(client_address(scope)))
+                if retry_after is not None:
+                    return await send_json(send, admission.rejection_body(429), 429,
+                                           {'Retry-After': retry_after})
+
+            started, retry_after = await lane.acquire_async()
+            if started is None:
+                return await send_json(send, admission.rejection_body(503), 503,
+                                       {'Retry-After': retry_after})
+            try:
+                await handler(scope, body, send)
+            finally:
+                lane.release(started)
+        return wrapped
+    return decorator
+
+# ==================== ROUTES ====================
+
+@admit(admission.PREDICT_LANE, rate_limited=True)
+async def predict(scope, body, send):
+    """Async twin of app.predict"""
+    try:
+        if not flask_app.MODELS or len(flask_app.MODELS) < 6:
+            return await send_json(send, {'error': 'Models not loaded. Please check models folder.'}, 500)
+
+        data = load_json(scope, body)
+
+        if not flask_app.has_required_fields(data):
+            return await send_json(send, {'error': 'Missing required fields'}, 400)
+
+        outcome = await run_inference(flask_app.run_ensemble, data)
+
+        if outcome is None:
+            return await send_json(send, {'error': 'No models available for prediction'}, 500)
+
+        risk_level, risk_percentage, skipped_models = outcome
+
+        # Save to database
+        user = load_session(scope).get('user')
+        await run_db(flask_app.save_prediction, data, risk_percentage, risk_level, user)
+
+        await send_json(vary_cookie(send),
+                        flask_app.build_prediction_response(risk_level, risk_percentage, skipped_models), 200)
+
+    except Exception as e:
+        print(f"Error in prediction: {str(e)}")
+        await send_json(send, {'error': str(e)}, 500)
+
+@admit(admission.CONTENT_LANE)
+async def get_content(scope, body, send):
+    """Async twin of app.get_content"""
+    query = parse_qs(scope.get('query_string', b'').decode('latin-1'))
+    risk_level = query.get('risk_level', [None])[0]
+    if not risk_level:
+        return await send_json(send, {'error': 'Risk level required'}, 400)
+
+    await send_json(send, {
+        'precautions': flask_app.get_precautions(risk_level),
+        'diet_plan': flask_app.get_diet_plan(risk_level)
+    }, 200)
+
+@admit(admission.HISTORY_LANE)
+async def get_history(scope, body, send):
+    """Async twin of app.get_history"""
+    try:
+        history = await run_db(flask_app.fetch_history)
+        await send_json(send, {'history': history}, 200)
+    except Exception as e:
+        await send_json(send, {'error': str(e)}, 500)
+
+async def auth_status(scope, receive, send):
+    """Async twin of app.api_auth_status"""
+    session = load_session(scope)
+    await send_json(vary_cookie(send), {'logged_in': bool(session.get('logged_in')), 'user': session.get('user')}, 200)
+
+ROUTES = {
+    ('POST', '/api/predict'): predict,
+    ('GET', '/api/get-content'): get_content,
+    ('GET', '/api/history'): get_history,
+    ('GET', '/api/auth-status'): auth_status,
+}
+
+# ==================== ASGI APPLICATION ====================
+
+async def lifespan(scope, receive, send):
+    """Handle server startup and shutdown"""
+    while True:
+        message = await receive()
+        if message['type'] == 'lifespan.startup':
+            await send({'type': 'lifespan.startup.complete'})
+        elif message['type'] == 'lifespan.shutdown':
+            inference_executor.shutdown(wait=False, cancel_futures=True)
+            db_executor.shutdown(wait=True)
+            await send({'type': 'lifespan.shutdown.complete'})
+            return
+
+async def app(scope, receive, send):
+    """ASGI entry point"""
+    if scope['type'] == 'lifespan':
+        return await lifespan(scope, receive, send)
+
+    if scope['type'] == 'http':
+        handler = ROUTES.get((scope['method'], scope['path']))
+        if handler is not None:
+            return await handler(scope, receive, send)
+
+    await fallback(scope, receive, send)
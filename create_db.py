@@ -6,8 +6,11 @@ Description: Helper script to create and initialize the SQLite database
 """
 
 import sqlite3
+from datetime import datetime
 from pathlib import Path
 
+import storage
+
 # ==================== CONFIGURATION ====================
 
 BASE_DIR = Path(__file__).parent
@@ -28,51 +31,22 @@ try:
     conn = sqlite3.connect(DATABASE_PATH)
     cursor = conn.cursor()
     
-    # Drop existing table if it exists (for reset)
-    # Uncomment below to reset database
-    # cursor.execute('DROP TABLE IF EXISTS predictions')
-    
-    # Drop existing table if it exists (for reset)
+    # Drop tables of the single-file layouts (for reset)
+    cursor.execute('DROP VIEW IF EXISTS predictions')
     cursor.execute('DROP TABLE IF EXISTS predictions')
     
-    # Create predictions table
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS predictions (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            age INTEGER NOT NULL,
-            sex INTEGER NOT NULL,
-            chest_pain_type INTEGER NOT NULL,
-            resting_blood_pressure INTEGER NOT NULL,
-            cholesterol INTEGER NOT NULL,
-            fasting_blood_sugar INTEGER NOT NULL,
-            resting_ecg INTEGER NOT NULL,
-            max_heart_rate INTEGER NOT NULL,
-            exercise_induced_angina INTEGER NOT NULL,
-            st_depression REAL NOT NULL,
-            st_slope INTEGER NOT NULL,
-            major_vessels INTEGER NOT NULL,
-            thalassemia INTEGER NOT NULL,
-            risk_percentage REAL NOT NULL,
-            risk_level TEXT NOT NULL,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-    ''')
-    
-    # Create index for faster queries
-    cursor.execute('''
-        CREATE INDEX IF NOT EXISTS idx_created_at 
-        ON predictions(created_at DESC)
-    ''')
-    
     conn.commit()
     conn.close()
     
+    # Drop every partition file and create the current partition
+    storage.init_storage(DATABASE_PATH)
+    storage.clear_all(DATABASE_PATH)
+    
     print(f"\n[OK] Database created successfully at:")
     print(f"  {DATABASE_PATH}")
     print(f"\n[OK] Tables created:")
-    print(f"  - predictions (17 columns)")
-    print(f"\n[OK] Indices created:")
-    print(f"  - idx_created_at")
+    print(f"  - {storage.partition_for(datetime.now())} (17 columns) in")
+    print(f"    {storage.partition_path(DATABASE_PATH, storage.partition_for(datetime.now()))}")
     
 except sqlite3.Error as e:
     print(f"\n[ERROR] Error creating database: {e}")
@@ -0,0 +1,192 @@
+"""
+Heart Disease Prediction - Input Drift Monitor
+Author: Your Name
+Date: 2026
+Description: Streaming per-feature statistics over live prediction traffic,
+compared against reference statistics captured from the training data by
+train_models.py. Each scored row costs O(1): Welford mean/variance for every
+feature, fixed-bin counts for the categorical fields and a positive-vote
+counter per model. Statistics are per worker process.
+"""
+
+import math
+import os
+import threading
+
+import joblib
+import numpy as np
+
+from schema import FEATURES
+
+# ==================== CONFIGURATION ====================
+
+# Fixed bins for the categorical fields; anything else lands in an overflow bin
+CATEGORICAL_BINS = {
+    'sex': [0, 1],
+    'chest_pain_type': [0, 1, 2, 3],
+    'fasting_blood_sugar': [0, 1],
+    'resting_ecg': [0, 1, 2],
+    'exercise_induced_angina': [0, 1],
+    'st_slope': [0, 1, 2],
+    'major_vessels': [0, 1, 2, 3, 4],
+    'thalassemia': [0, 1, 2, 3],
+}
+
+REFERENCE_FILE = 'drift_reference.pkl'
+
+# Live rows needed before drift is reported
+MIN_SAMPLES = int(os.environ.get('HEARTGUARD_DRIFT_MIN_SAMPLES', '100'))
+# Standardised mean shift, population stability index and vote-rate change
+# beyond which a feature or model is flagged
+MEAN_SHIFT_THRESHOLD = float(os.environ.get('HEARTGUARD_DRIFT_MEAN_SHIFT', '0.25'))
+PSI_THRESHOLD = float(os.environ.get('HEARTGUARD_DRIFT_PSI', '0.2'))
+VOTE_RATE_THRESHOLD = float(os.environ.get('HEARTGUARD_DRIFT_VOTE_RATE', '0.15'))
+
+# ==================== BINNING ====================
+
+def bin_index(field, value):
+    """Fixed bin for a categorical value; the last index is the overflow bin"""
+    bins = CATEGORICAL_BINS[field]
+    try:
+        return bins.index(int(value))
+    except (TypeError, ValueError):
+        return len(bins)
+
+def _bin_frequencies(counts):
+    total = sum(counts)
+    return [count / total if total else 0.0 for count in counts]
+
+# ==================== REFERENCE ====================
+
+def build_reference(X, votes):
+    """
+    Reference statistics for train_models.py
+    X: raw (unscaled) feature rows in FEATURES order
+    votes: {model_name: array of 0/1 predictions on held-out rows}, since
+    rates on the training rows reflect overfitting, not live behaviour
+    """
+    X = np.asarray(X, dtype=float)
+    reference = {'n': int(X.shape[0]), 'features': {}, 'categorical': {}, 'vote_rate': {}}
+    for i, field in enumerate(FEATURES):
+        column = X[:, i]
+        reference['features'][field] = {
+            'mean': float(column.mean()),
+            'std': float(column.std(ddof=1)) if len(column) > 1 else 0.0,
+        }
+        if field in CATEGORICAL_BINS:
+            counts = [0] * (len(CATEGORICAL_BINS[field]) + 1)
+            for value in column:
+                counts[bin_index(field, value)] += 1
+            reference['categorical'][field] = _bin_frequencies(counts)
+    for model_name, predictions in votes.items():
+        reference['vote_rate'][model_name] = float(np.mean(predictions))
+    return reference
+
+def load_reference(models_dir):
+    """Load the saved reference, or None if train_models.py has not written one"""
+    path = models_dir / REFERENCE_FILE
+    if not path.exists():
+        print(f"[WARNING] Warning: {REFERENCE_FILE} not found - drift monitor has no reference")
+        return None
+    print(f"[OK] Loaded drift reference: {REFERENCE_FILE}")
+    return joblib.load(path)
+
+# ==================== LIVE STATISTICS ====================
+
+_lock = threading.Lock()
+_reference = None
+_count = 0
+_mean = [0.0] * len(FEATURES)
+_m2 = [0.0] * len(FEATURES)
+_bin_counts = {field: [0] * (len(bins) + 1) for field, bins in CATEGORICAL_BINS.items()}
+_votes = {}
+_voted = {}
+
+def set_reference(reference):
+    global _reference
+    _reference = reference
+
+def observe(rows, predictions):
+    """
+    Fold scored rows into the running statistics
+    rows: raw feature rows in FEATURES order
+    predictions: {model_name: 0/1 vote, or one vote per row}
+    """
+    global _count
+    with _lock:
+        for r, row in enumerate(rows):
+            _count += 1
+            for i, field in enumerate(FEATURES):
+                value = float(row[i])
+                delta = value - _mean[i]
+                _mean[i] += delta / _count
+                _m2[i] += delta * (value - _mean[i])
+                if field in _bin_counts:
+                    _bin_counts[field][bin_index(field, row[i])] += 1
+            for model_name, vote in predictions.items():
+                vote = vote[r] if np.ndim(vote) else vote
+                _votes[model_name] = _votes.get(model_name, 0) + int(vote)
+                _voted[model_name] = _voted.get(model_name, 0) + 1
+
+def population_stability_index(expected, actual, floor=1e-4):
+    """PSI between two bin frequency vectors"""
+    psi = 0.0
+    for e, a in zip(expected, actual):
+        e, a = max(e, floor), max(a, floor)
+        psi += (a - e) * math.log(a / e)
+    return psi
+
+def report():
+    """Live statistics, compared against the reference when one is loaded"""
+    with _lock:
+        count = _count
+        means = list(_mean)
+        variances = [m2 / (count - 1) if count > 1 else 0.0 for m2 in _m2]
+        bin_counts = {field: list(counts) for field, counts in _bin_counts.items()}
+        vote_rates = {name: _votes[name] / _voted[name] for name in _voted if _voted[name]}
+
+    reference = _reference
+    features = {}
+    drifted = []
+    for i, field in enumerate(FEATURES):
+        entry = {'mean': round(means[i], 4), 'std': round(math.sqrt(variances[i]), 4)}
+        if reference is not None:
+            ref = reference['features'][field]
+            entry['reference_mean'] = round(ref['mean'], 4)
+            entry['mean_shift'] = round(abs(means[i] - ref['mean']) / ref['std'], 4) if ref['std'] else 0.0
+            flagged = entry['mean_shift'] > MEAN_SHIFT_THRESHOLD
+            if field in bin_counts:
+                entry['psi'] = round(population_stability_index(
+                    reference['categorical'][field], _bin_frequencies(bin_counts[field])
+                ), 4)
+                flagged = flagged or entry['psi'] > PSI_THRESHOLD
+            entry['drift'] = flagged and count >= MIN_SAMPLES
+            if entry['drift']:
+                drifted.append(field)
+        features[field] = entry
+
+    models = {}
+    for model_name, rate in vote_rates.items():
+        entry = {'vote_rate': round(rate, 4)}
+        if reference is not None and model_name in reference['vote_rate']:
+            entry['reference_vote_rate'] = round(reference['vote_rate'][model_name], 4)
+            entry['drift'] = (abs(rate - reference['vote_rate'][model_name]) > VOTE_RATE_THRESHOLD
+                              and count >= MIN_SAMPLES)
+            if entry['drift']:
+                drifted.append(model_name)
+        models[model_name] = entry
+
+    return {
+        'samples': count,
+        'min_samples': MIN_SAMPLES,
+        'has_reference': reference is not None,
+        'drift': bool(drifted),
+        'drifted': drifted,
+        'features': features,
+        'models': models,
+    }
+
+def summary():
+    """Compact drift state for the metrics endpoint"""
+    full = report()
+    return {key: full[key] for key in ('samples', 'has_reference', 'drift', 'drifted')}
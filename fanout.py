@@ -0,0 +1,133 @@
+"""
+Heart Disease Prediction - Parallel Model Fan-out
+Author: Your Name
+Date: 2026
+Description: Optional execution mode (HEARTGUARD_FANOUT=1) that evaluates the
+ensemble's models concurrently instead of one after another. Much of the
+heavier models' work runs in numpy with the GIL released, so a request takes
+roughly as long as its slowest model and never longer than the timeout,
+which runs from submission and so includes any wait for a busy pool.
+Models that miss it, or raise, are skipped and the vote is taken over the
+models that finished.
+
+Each model runs on its own small thread pool, so a call that overruns its
+timeout (and keeps running, since threads cannot be interrupted) only ties
+up that model's threads. While such a straggler is still running, later
+requests skip the model at once instead of queueing behind it.
+"""
+
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+
+# ==================== CONFIGURATION ====================
+
+ENABLED = os.environ.get('HEARTGUARD_FANOUT', '0').lower() in ('1', 'true', 'yes')
+# Budget for every model, measured from when the request submits its call
+TIMEOUT_MS = float(os.environ.get('HEARTGUARD_MODEL_TIMEOUT_MS', '500'))
+# Threads per model
+WORKERS = int(os.environ.get('HEARTGUARD_FANOUT_WORKERS', '2'))
+# Overrunning calls a model may have running before it is skipped outright
+MAX_STRAGGLERS = int(os.environ.get('HEARTGUARD_FANOUT_MAX_STRAGGLERS', '1'))
+
+_pools = {}
+_lock = threading.Lock()
+_stragglers = {}
+_stats = {'requests': 0, 'skipped': {}, 'timed_out': {}}
+
+# ==================== FAN-OUT ====================
+
+class _Call:
+    """One model evaluation; finished is set by the pool thread"""
+
+    def __init__(self, name):
+        self.name = name
+        self.finished = False
+        self.overdue = False
+
+def _pool(name):
+    """Per-model pool, created on first use so forked workers get their own"""
+    with _lock:
+        if name not in _pools:
+            _pools[name] = ThreadPoolExecutor(max_workers=WORKERS, thread_name_prefix=f'heartguard-{name}')
+        return _pools[name]
+
+def _vote(call, model, features):
+    try:
+        return int(model.predict(features)[0])
+    finally:
+        with _lock:
+            call.finished = True
+            if call.overdue:
+                _stragglers[call.name] -= 1
+
+def _abandon(call, future):
+    """Give up on a call; one that is already running becomes a straggler"""
+    if future.cancel():
+        return
+    with _lock:
+        if not call.finished:
+            call.overdue = True
+            _stragglers[call.name] = _stragglers.get(call.name, 0) + 1
+
+def predict_all(models, names, features, timeout_ms=None):
+    """
+    Evaluate each named model on one scaled row in parallel
+    Returns: (predictions, skipped) where skipped lists the models that
+    timed out, failed or still had a straggler running, in ensemble order
+    """
+    timeout = (TIMEOUT_MS if timeout_ms is None else timeout_ms) / 1000.0
+    # One deadline for every call: time spent queued behind a model's other
+    # calls counts, so a saturated pool cannot hold the request past it
+    deadline = time.perf_counter() + timeout
+
+    pending, skipped, timed_out = {}, set(), []
+    for name in names:
+        if name not in models:
+            continue
+        with _lock:
+            busy = _stragglers.get(name, 0) >= MAX_STRAGGLERS
+        if busy:
+            skipped.add(name)
+            continue
+        call = _Call(name)
+        pending[_pool(name).submit(_vote, call, models[name], features)] = call
+
+    predictions = {}
+    done, not_done = wait(pending, timeout=max(0.0, deadline - time.perf_counter()))
+    for future in done:
+        name = pending[future].name
+        try:
+            predictions[name] = future.result()
+        except Exception as e:
+            print(f"[WARNING] Model {name} failed: {e}")
+            skipped.add(name)
+    for future in not_done:
+        call = pending[future]
+        _abandon(call, future)
+        skipped.add(call.name)
+        timed_out.append(call.name)
+
+    skipped = [name for name in names if name in skipped]
+    with _lock:
+        _stats['requests'] += 1
+        for name in skipped:
+            _stats['skipped'][name] = _stats['skipped'].get(name, 0) + 1
+        for name in timed_out:
+            _stats['timed_out'][name] = _stats['timed_out'].get(name, 0) + 1
+    return predictions, skipped
+
+def snapshot():
+    """Fan-out mode and per-model skip counts for the metrics endpoint"""
+    with _lock:
+        return {
+            'enabled': ENABLED,
+            'timeout_ms': TIMEOUT_MS,
+            'workers_per_model': WORKERS,
+            'max_stragglers': MAX_STRAGGLERS,
+            'requests': _stats['requests'],
+            'skipped': dict(_stats['skipped']),
+            'timed_out': dict(_stats['timed_out']),
+            'stragglers': {name: count for name, count in _stragglers.items() if count},
+        }
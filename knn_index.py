@@ -0,0 +1,67 @@
+"""
+Heart Disease Prediction - KNN Neighbor Search
+Author: Your Name
+Date: 2026
+Description: Neighbor search settings for the KNN model. train_models.py fits
+the KNeighborsClassifier with an explicit KD-tree or ball tree, which
+knn.pkl pickles along with the model, so the app loads the tree without
+rebuilding it. Recall of the tree against exact brute-force KNN and its query
+latency are measured at training time and saved to
+models/knn_index_report.pkl, which the app prints at startup.
+"""
+
+import os
+import time
+
+import joblib
+from sklearn.neighbors import NearestNeighbors
+
+# ==================== CONFIGURATION ====================
+
+REPORT_FILE = 'knn_index_report.pkl'
+
+# 'kd_tree' suits the 13 low-cardinality features; 'ball_tree' scales better
+# with many features or clustered data
+ALGORITHM = os.environ.get('HEARTGUARD_KNN_ALGORITHM', 'kd_tree')
+LEAF_SIZE = int(os.environ.get('HEARTGUARD_KNN_LEAF_SIZE', '30'))
+
+# ==================== EVALUATION ====================
+
+def _mean_latency_ms(func, X, repeats):
+    started = time.perf_counter()
+    for _ in range(repeats):
+        func(X)
+    return (time.perf_counter() - started) * 1000 / repeats
+
+def evaluate_index(knn, X_train, X_query, repeats=20):
+    """
+    Recall@k of a fitted KNeighborsClassifier's search against exact
+    brute-force neighbors, and query latency for a single row and a batch
+    """
+    k = knn.n_neighbors
+    exact = NearestNeighbors(n_neighbors=k, algorithm='brute', metric='euclidean').fit(X_train)
+    exact_neighbors = exact.kneighbors(X_query, return_distance=False)
+    index_neighbors = knn.kneighbors(X_query, return_distance=False)
+    hits = sum(len(set(a) & set(b)) for a, b in zip(exact_neighbors, index_neighbors))
+
+    single = X_query[:1]
+    return {
+        'algorithm': knn._fit_method,
+        'leaf_size': knn.leaf_size,
+        'recall': round(hits / (k * len(X_query)), 4),
+        'queries': int(len(X_query)),
+        'single_ms': round(_mean_latency_ms(knn.kneighbors, single, repeats), 4),
+        'single_brute_ms': round(_mean_latency_ms(exact.kneighbors, single, repeats), 4),
+        'batch_ms': round(_mean_latency_ms(knn.kneighbors, X_query, repeats), 4),
+        'batch_brute_ms': round(_mean_latency_ms(exact.kneighbors, X_query, repeats), 4),
+    }
+
+def load_report(models_dir):
+    """Print the saved recall/latency report; None if train_models.py has not written one"""
+    path = models_dir / REPORT_FILE
+    if not path.exists():
+        return None
+    report = joblib.load(path)
+    print(f"[OK] KNN search: {report.get('algorithm', 'n/a')}, recall {report.get('recall', 'n/a')}, "
+          f"single query {report.get('single_ms', 'n/a')} ms")
+    return report
@@ -0,0 +1,253 @@
+"""
+Heart Disease Prediction - Reduced-Precision Inference
+Author: Your Name
+Date: 2026
+Description: Optional float32 inference mode (HEARTGUARD_FLOAT32=1). The MLP
+weights, SVM support vectors, brute-force KNN reference matrix (a KNN fitted
+with a tree keeps its tree) and logistic regression coefficients are copied
+into lean float32 predictors evaluated with numpy, and the float64
+estimators (including the MLP's optimizer state) are released. Each lean
+model must agree with its float64 original on a validation set before it
+replaces it. A per-model memory report is printed at startup either way.
+"""
+
+import csv
+import os
+import sys
+
+import numpy as np
+
+from schema import MODEL_NAMES
+
+# ==================== CONFIGURATION ====================
+
+FLOAT32 = os.environ.get('HEARTGUARD_FLOAT32', '0').lower() in ('1', 'true', 'yes')
+# Fraction of validation rows on which a lean model must match float64
+MIN_AGREEMENT = float(os.environ.get('HEARTGUARD_FLOAT32_MIN_AGREEMENT', '1.0'))
+
+# ==================== LEAN PREDICTORS ====================
+
+def _squared_distances(X, reference, reference_norms):
+    """Squared euclidean distances between rows of X and reference, in float32"""
+    X_norms = np.einsum('ij,ij->i', X, X)[:, None]
+    return np.maximum(X_norms + reference_norms[None, :] - 2.0 * (X @ reference.T), 0.0)
+
+class Float32MLP:
+    """Forward pass of a fitted MLPClassifier with float32 weights"""
+
+    _ACTIVATIONS = {
+        'identity': lambda a: a,
+        'relu': lambda a: np.maximum(a, 0.0),
+        'tanh': np.tanh,
+        'logistic': lambda a: 1.0 / (1.0 + np.exp(-a)),
+    }
+
+    def __init__(self, mlp):
+        self.coefs_ = [np.ascontiguousarray(c, dtype=np.float32) for c in mlp.coefs_]
+        self.intercepts_ = [np.ascontiguousarray(b, dtype=np.float32) for b in mlp.intercepts_]
+        self.activation = mlp.activation
+        self.out_activation_ = mlp.out_activation_
+        self.classes_ = mlp.classes_
+
+    def decision_function(self, X):
+        a = np.asarray(X, dtype=np.float32)
+        hidden = self._ACTIVATIONS[self.activation]
+        last = len(self.coefs_) - 1
+        for i, (W, b) in enumerate(zip(self.coefs_, self.intercepts_)):
+            a = a @ W + b
+            if i != last:
+                a = hidden(a)
+        return a
+
+    def predict(self, X):
+        scores = self.decision_function(X)
+        if self.out_activation_ == 'logistic' and scores.shape[1] == 1:
+            # logistic(z) > 0.5 exactly when z > 0
+            return self.classes_[(scores[:, 0] > 0).astype(int)]
+        return self.classes_[np.argmax(scores, axis=1)]
+
+class Float32SVC:
+    """RBF decision function of a fitted binary SVC with float32 support vectors"""
+
+    def __init__(self, svc):
+        self.support_vectors_ = np.ascontiguousarray(svc.support_vectors_, dtype=np.float32)
+        self._sv_norms = np.einsum('ij,ij->i', self.support_vectors_, self.support_vectors_)
+        self.dual_coef_ = np.ascontiguousarray(svc.dual_coef_[0], dtype=np.float32)
+        self.intercept_ = np.float32(svc.intercept_[0])
+        self.gamma = np.float32(svc._gamma)
+        self.classes_ = svc.classes_
+
+    @staticmethod
+    def supports(svc):
+        return svc.kernel == 'rbf' and len(svc.classes_) == 2
+
+    def decision_function(self, X):
+        X = np.asarray(X, dtype=np.float32)
+        kernel = np.exp(-self.gamma * _squared_distances(X, self.support_vectors_, self._sv_norms))
+        return kernel @ self.dual_coef_ + self.intercept_
+
+    def predict(self, X):
+        return self.classes_[(self.decision_function(X) > 0).astype(int)]
+
+class Float32KNN:
+    """Brute-force euclidean KNN over a float32 copy of the training matrix"""
+
+    def __init__(self, knn):
+        self.fit_X_ = np.ascontiguousarray(knn._fit_X, dtype=np.float32)
+        self._fit_norms = np.einsum('ij,ij->i', self.fit_X_, self.fit_X_)
+        self.y_ = np.asarray(knn._y, dtype=np.intp)
+        self.n_neighbors = knn.n_neighbors
+        self.classes_ = knn.classes_
+
+    @staticmethod
+    def supports(knn):
+        euclidean = knn.effective_metric_ == 'euclidean' or (
+            knn.effective_metric_ == 'minkowski' and knn.effective_metric_params_.get('p', knn.p) == 2
+        )
+        # A fitted KD/ball tree answers in sub-linear time; a brute-force
+        # float32 scan would trade that away for memory
+        brute = knn._fit_method == 'brute'
+        return brute and euclidean and knn.weights == 'uniform' and np.ndim(knn._y) == 1
+
+    def predict(self, X):
+        X = np.asarray(X, dtype=np.float32)
+        distances = _squared_distances(X, self.fit_X_, self._fit_norms)
+        k = self.n_neighbors
+        neighbors = np.argpartition(distances, k - 1, axis=1)[:, :k]
+        votes = np.apply_along_axis(np.bincount, 1, self.y_[neighbors], minlength=len(self.classes_))
+        # argmax returns the lowest class on ties, as sklearn's mode does
+        return self.classes_[np.argmax(votes, axis=1)]
+
+class Float32Linear:
+    """Binary or multinomial linear classifier with float32 coefficients"""
+
+    def __init__(self, model):
+        self.coef_ = np.ascontiguousarray(model.coef_, dtype=np.float32)
+        self.intercept_ = np.ascontiguousarray(model.intercept_, dtype=np.float32)
+        self.classes_ = model.classes_
+
+    def predict(self, X):
+        scores = np.asarray(X, dtype=np.float32) @ self.coef_.T + self.intercept_
+        if scores.shape[1] == 1:
+            return self.classes_[(scores[:, 0] > 0).astype(int)]
+        return self.classes_[np.argmax(scores, axis=1)]
+
+def to_float32(name, model):
+    """Lean float32 predictor for a model, or None if it is not supported"""
+    kind = type(model).__name__
+    if name == 'mlp' and kind == 'MLPClassifier':
+        return Float32MLP(model)
+    if name == 'svm' and kind == 'SVC' and Float32SVC.supports(model):
+        return Float32SVC(model)
+    if name == 'knn' and kind == 'KNeighborsClassifier' and Float32KNN.supports(model):
+        return Float32KNN(model)
+    if name == 'logistic_regression' and kind == 'LogisticRegression':
+        return Float32Linear(model)
+    return None
+
+# ==================== VALIDATION ====================
+
+def load_validation_set(data_file, scaler):
+    """Scaled feature rows from the training CSV, or None if unavailable"""
+    if not data_file.exists():
+        return None
+    with open(data_file, newline='') as fh:
+        rows = [row for row in csv.DictReader(fh)]
+    if not rows:
+        return None
+    columns = [column for column in rows[0] if column != 'target']
+    X = np.array([[float(row[column]) for column in columns] for row in rows])
+    return scaler.transform(X)
+
+def agreement(original, lean, X):
+    """Fraction of rows on which both models predict the same class"""
+    return float(np.mean(original.predict(X) == lean.predict(X)))
+
+# ==================== MEMORY REPORT ====================
+
+def resident_bytes(obj, seen=None):
+    """Approximate bytes held by a model: its numpy buffers plus Python objects"""
+    seen = set() if seen is None else seen
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    if isinstance(obj, np.ndarray):
+        # Views are charged for the buffer they share, once
+        base = 0 if obj.flags.owndata else resident_bytes(obj.base, seen)
+        return sys.getsizeof(obj) + base
+    size = sys.getsizeof(obj, 0)
+    if isinstance(obj, dict):
+        return size + sum(resident_bytes(k, seen) + resident_bytes(v, seen) for k, v in obj.items())
+    if isinstance(obj, (list, tuple, set)):
+        return size + sum(resident_bytes(item, seen) for item in obj)
+    if hasattr(obj, '__dict__'):
+        return size + resident_bytes(vars(obj), seen)
+    if hasattr(obj, '__getstate__') and type(obj).__module__.startswith('sklearn'):
+        # Cython objects such as sklearn's Tree keep their arrays in the state
+        state = obj.__getstate__()
+        if isinstance(state, (dict, list, tuple)):
+            return size + resident_bytes(state, seen)
+    return size
+
+def memory_report(models):
+    """Per-model resident bytes and dtype"""
+    report = {}
+    for name in MODEL_NAMES:
+        if name in models:
+            report[name] = {
+                'type': type(models[name]).__name__,
+                'bytes': resident_bytes(models[name]),
+            }
+    return report
+
+# ==================== STARTUP ====================
+
+_state = {'float32': False, 'converted': [], 'agreement': {}, 'memory_before': {}, 'memory': {}}
+
+def prepare_models(models, data_file):
+    """Apply float32 mode if enabled and print the per-model memory report"""
+    _state['memory_before'] = memory_report(models)
+
+    if FLOAT32:
+        X = load_validation_set(data_file, models['scaler']) if 'scaler' in models else None
+        if X is None:
+            print("[WARNING] Float32 mode needs a validation set - keeping float64 models")
+        else:
+            for name in MODEL_NAMES:
+                if name not in models:
+                    continue
+                lean = to_float32(name, models[name])
+                if lean is None:
+                    continue
+                score = agreement(models[name], lean, X)
+                _state['agreement'][name] = round(score, 4)
+                if score >= MIN_AGREEMENT:
+                    models[name] = lean
+                    _state['converted'].append(name)
+                else:
+                    print(f"[WARNING] {name} float32 agreement {score:.4f} < {MIN_AGREEMENT} - keeping float64")
+            # True only if at least one model actually runs in float32
+            _state['float32'] = bool(_state['converted'])
+            if not _state['converted']:
+                print("[WARNING] Float32 mode converted no models - keeping float64 models")
+
+    _state['memory'] = memory_report(models)
+
+    print("[INFO] Model memory:")
+    for name, entry in _state['memory'].items():
+        before = _state['memory_before'][name]['bytes']
+        line = f"  {name:20s} {entry['bytes'] / 1024:8.1f} KiB  ({entry['type']})"
+        if entry['bytes'] != before:
+            line += f"  was {before / 1024:.1f} KiB, agreement {_state['agreement'].get(name)}"
+        print(line)
+    return models
+
+def snapshot():
+    """Precision mode and memory footprint for the metrics endpoint"""
+    return {
+        'float32': _state['float32'],
+        'converted': list(_state['converted']),
+        'agreement': _state['agreement'],
+        'model_bytes': {name: entry['bytes'] for name, entry in _state['memory'].items()},
+        'total_bytes': sum(entry['bytes'] for entry in _state['memory'].values()),
+    }
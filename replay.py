@@ -0,0 +1,309 @@
+"""
+Heart Disease Prediction - Traffic Replay Harness
+Author: Your Name
+Date: 2026
+Description: Replays recorded prediction inputs against a running instance
+to test capacity and model swaps with production-shaped traffic. Inputs come
+from the prediction partitions of a HeartGuard database or from an NDJSON capture
+(optionally gzipped, e.g. a partition archive). Reports latency percentiles
+(timed from each request's scheduled arrival when --rate is set, so client
+queueing under overload is counted), error rates and, with --compare-url,
+result differences between two instances serving different model versions.
+
+Usage:
+    python replay.py --db database/heart_disease.db --rate 50 --profile poisson
+    python replay.py --ndjson capture.ndjson --concurrency 16 --rate 0
+    python replay.py --db prod.db --url http://localhost:5000 --compare-url http://localhost:5001
+"""
+
+import argparse
+import gzip
+import json
+import random
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+from itertools import islice
+
+import storage
+from schema import FEATURES
+
+# ==================== INPUT SOURCES ====================
+
+def load_from_db(db_path, limit=None):
+    """Recorded inputs from the prediction partitions, oldest first"""
+    rows = storage.iter_rows(db_path)
+    if limit:
+        rows = islice(rows, int(limit))
+    return [{field: row[field] for field in FEATURES} for row in rows]
+
+def _extract_payload(record):
+    """Find the /api/predict body in a captured record"""
+    if all(field in record for field in FEATURES):
+        return {field: record[field] for field in FEATURES}
+    for key in ('json', 'body', 'payload', 'request'):
+        value = record.get(key)
+        if isinstance(value, str):
+            try:
+                value = json.loads(value)
+            except ValueError:
+                continue
+        if isinstance(value, dict):
+            payload = _extract_payload(value)
+            if payload is not None:
+                return payload
+    return None
+
+def load_from_ndjson(path, limit=None):
+    """Recorded inputs from an NDJSON capture; lines without a payload are skipped"""
+    opener = gzip.open if str(path).endswith('.gz') else open
+    payloads = []
+    skipped = 0
+    with opener(path, 'rt', encoding='utf-8') as fh:
+        for line in fh:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                payload = _extract_payload(json.loads(line))
+            except ValueError:
+                payload = None
+            if payload is None:
+                skipped += 1
+                continue
+            payloads.append(payload)
+            if limit and len(payloads) >= limit:
+                break
+    if skipped:
+        print(f"[WARNING] Skipped {skipped} lines without a prediction payload")
+    return payloads
+
+# ==================== ARRIVAL PROFILES ====================
+
+def arrival_times(count, profile, rate, burst_size):
+    """Offsets in seconds at which each request is sent; rate 0 means closed loop"""
+    if rate <= 0:
+        return [0.0] * count
+    if profile == 'constant':
+        return [i / rate for i in range(count)]
+    if profile == 'poisson':
+        offsets, t = [], 0.0
+        for _ in range(count):
+            offsets.append(t)
+            t += random.expovariate(rate)
+        return offsets
+    if profile == 'burst':
+        # Same mean rate, delivered as back-to-back groups of burst_size
+        period = burst_size / rate
+        return [(i // burst_size) * period for i in range(count)]
+    raise ValueError(f'Unknown profile: {profile}')
+
+# ==================== REPLAY ====================
+
+def send(url, payload, client_ip=None, timeout=30):
+    """POST one payload; returns (status, body dict or None, latency seconds)"""
+    body = json.dumps(payload).encode('utf-8')
+    req = urllib.request.Request(
+        url.rstrip('/') + '/api/predict', data=body, method='POST',
+        headers={'Content-Type': 'application/json'}
+    )
+    if client_ip:
+        req.add_header('X-Forwarded-For', client_ip)
+    started = time.perf_counter()
+    try:
+        with urllib.request.urlopen(req, timeout=timeout) as resp:
+            status, raw = resp.status, resp.read()
+    except urllib.error.HTTPError as e:
+        status, raw = e.code, e.read()
+    except Exception as e:
+        return f'error: {type(e).__name__}', None, time.perf_counter() - started
+    latency = time.perf_counter() - started
+    try:
+        return status, json.loads(raw), latency
+    except ValueError:
+        return status, None, latency
+
+def replay(payloads, url, compare_url=None, concurrency=8, profile='constant',
+           rate=10.0, burst_size=10, clients=0, timeout=30):
+    """Replay payloads on the chosen arrival profile; returns per-request results"""
+    offsets = arrival_times(len(payloads), profile, rate, burst_size)
+    lock = threading.Lock()
+
+    open_loop = rate > 0
+    # Each target gets its own senders, so both see every request at its
+    # scheduled arrival and a slow target cannot delay the other
+    targets = {'': url}
+    if compare_url:
+        targets['compare_'] = compare_url
+
+    def run(i, scheduled, prefix):
+        # In open loop a request is late from its scheduled arrival, not from
+        # when a free client thread picks it up; that client-side queueing is
+        # part of the latency an overloaded server causes
+        queued = time.perf_counter() - scheduled if open_loop else 0.0
+        client_ip = f'10.{(i % clients) // 256 % 256}.{(i % clients) % 256}.1' if clients else None
+        status, body, latency = send(targets[prefix], payloads[i], client_ip, timeout)
+        with lock:
+            results[i].update({prefix + 'status': status, prefix + 'latency': queued + latency,
+                               prefix + 'queued': queued, prefix + 'body': body})
+
+    results = [{} for _ in payloads]
+    started = time.perf_counter()
+    with ExitStack() as stack:
+        pools = {
+            prefix: stack.enter_context(ThreadPoolExecutor(max_workers=concurrency))
+            for prefix in targets
+        }
+        for i, offset in enumerate(offsets):
+            delay = started + offset - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            for prefix, pool in pools.items():
+                pool.submit(run, i, started + offset, prefix)
+    return results, time.perf_counter() - started
+
+# ==================== REPORT ====================
+
+def percentile(sorted_values, q):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(q / 100 * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+def summarize(results, elapsed, prefix=''):
+    """Latency percentiles and error rate for one target"""
+    statuses = Counter(str(r[prefix + 'status']) for r in results)
+    latencies = sorted(r[prefix + 'latency'] * 1000 for r in results)
+    queued = sorted(r[prefix + 'queued'] * 1000 for r in results)
+    errors = sum(count for status, count in statuses.items() if status != '200')
+    return {
+        'requests': len(results),
+        'throughput_rps': round(len(results) / elapsed, 2) if elapsed else 0.0,
+        'error_rate': round(errors / len(results), 4) if results else 0.0,
+        'statuses': dict(statuses),
+        'latency_ms': {
+            'p50': round(percentile(latencies, 50), 2),
+            'p90': round(percentile(latencies, 90), 2),
+            'p95': round(percentile(latencies, 95), 2),
+            'p99': round(percentile(latencies, 99), 2),
+            'max': round(latencies[-1], 2) if latencies else 0.0,
+        },
+        # Client-side wait for a free sender, already included in latency_ms
+        'queued_ms': {
+            'p50': round(percentile(queued, 50), 2),
+            'p99': round(percentile(queued, 99), 2),
+            'max': round(queued[-1], 2) if queued else 0.0,
+        },
+    }
+
+def diff_results(payloads, results, max_examples=10):
+    """Compare risk level and percentage between the two targets"""
+    compared = level_flips = pct_changes = unparsed = 0
+    examples = []
+    for payload, r in zip(payloads, results):
+        if r['status'] != 200 or r['compare_status'] != 200:
+            continue
+        a, b = r['body'], r['compare_body']
+        # A 200 whose body is not a JSON object (e.g. a proxy page) cannot be diffed
+        if not isinstance(a, dict) or not isinstance(b, dict):
+            unparsed += 1
+            continue
+        compared += 1
+        level_changed = a.get('risk_level') != b.get('risk_level')
+        pct_changed = a.get('risk_percentage') != b.get('risk_percentage')
+        level_flips += level_changed
+        pct_changes += pct_changed
+        if (level_changed or pct_changed) and len(examples) < max_examples:
+            examples.append({
+                'input': payload,
+                'baseline': {k: a.get(k) for k in ('risk_level', 'risk_percentage')},
+                'candidate': {k: b.get(k) for k in ('risk_level', 'risk_percentage')},
+            })
+    return {
+        'compared': compared,
+        'unparsed': unparsed,
+        'risk_level_flips': level_flips,
+        'risk_percentage_changes': pct_changes,
+        'flip_rate': round(level_flips / compared, 4) if compared else 0.0,
+        'examples': examples,
+    }
+
+# ==================== MAIN ====================
+
+def main():
+    parser = argparse.ArgumentParser(description='Replay recorded HeartGuard traffic')
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument('--db', help='HeartGuard SQLite database (partitions are read from its partitions/ directory)')
+    source.add_argument('--ndjson', help='NDJSON capture (.gz allowed)')
+    parser.add_argument('--url', default='http://localhost:5000', help='Instance under test')
+    parser.add_argument('--compare-url', help='Second instance to diff results against')
+    parser.add_argument('--limit', type=int, help='Replay at most this many inputs')
+    parser.add_argument('--shuffle', action='store_true', help='Randomise replay order')
+    parser.add_argument('--concurrency', type=int, default=8, help='Maximum requests in flight per target')
+    parser.add_argument('--profile', choices=['constant', 'poisson', 'burst'], default='constant')
+    parser.add_argument('--rate', type=float, default=10.0,
+                        help='Mean arrivals per second (0 = closed loop at full concurrency)')
+    parser.add_argument('--burst-size', type=int, default=10, help='Requests per burst for --profile burst')
+    parser.add_argument('--clients', type=int, default=0,
+                        help='Spread requests over this many X-Forwarded-For addresses '
+                             '(the server only honours them with HEARTGUARD_TRUSTED_PROXIES=1)')
+    parser.add_argument('--timeout', type=float, default=30.0)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--json', action='store_true', help='Print the report as JSON')
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    payloads = load_from_db(args.db, args.limit) if args.db else load_from_ndjson(args.ndjson, args.limit)
+    if not payloads:
+        print("[ERROR] No inputs to replay")
+        return 1
+    if args.shuffle:
+        random.shuffle(payloads)
+
+    if not args.json:
+        print(f"[INFO] Replaying {len(payloads)} inputs against {args.url} "
+              f"({args.profile}, rate={args.rate}/s, concurrency={args.concurrency})")
+
+    results, elapsed = replay(
+        payloads, args.url, args.compare_url, args.concurrency, args.profile,
+        args.rate, args.burst_size, args.clients, args.timeout
+    )
+
+    report = {'elapsed_s': round(elapsed, 2), 'baseline': summarize(results, elapsed)}
+    if args.compare_url:
+        report['candidate'] = summarize(results, elapsed, prefix='compare_')
+        report['diff'] = diff_results(payloads, results)
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return 0
+
+    for name in ('baseline', 'candidate'):
+        if name not in report:
+            continue
+        summary = report[name]
+        latency = summary['latency_ms']
+        print(f"\n[INFO] {name}: {summary['requests']} requests, "
+              f"{summary['throughput_rps']} req/s, error rate {summary['error_rate']:.2%}")
+        print(f"  statuses: {summary['statuses']}")
+        print(f"  latency ms: p50={latency['p50']} p90={latency['p90']} "
+              f"p95={latency['p95']} p99={latency['p99']} max={latency['max']}")
+        queued = summary['queued_ms']
+        if queued['max'] > 0:
+            print(f"  client queueing ms (included above): p50={queued['p50']} "
+                  f"p99={queued['p99']} max={queued['max']}")
+    if 'diff' in report:
+        diff = report['diff']
+        print(f"\n[INFO] diff: {diff['compared']} compared, {diff['risk_level_flips']} risk level flips "
+              f"({diff['flip_rate']:.2%}), {diff['risk_percentage_changes']} percentage changes")
+        for example in diff['examples']:
+            print(f"  {example['baseline']} -> {example['candidate']}")
+    return 0
+
+if __name__ == '__main__':
+    raise SystemExit(main())
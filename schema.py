@@ -0,0 +1,20 @@
+"""
+Heart Disease Prediction - Shared Field Lists
+Author: Your Name
+Date: 2026
+Description: Names shared by the app, storage, training-side monitors and
+tools: the model input fields in the order the models expect them, and the
+ensemble's models in voting order. Kept dependency-free so stdlib-only
+modules can import it.
+"""
+
+# Model input order, matching the training CSV columns and the API payload
+FEATURES = [
+    'age', 'sex', 'chest_pain_type', 'resting_blood_pressure',
+    'cholesterol', 'fasting_blood_sugar', 'resting_ecg',
+    'max_heart_rate', 'exercise_induced_angina', 'st_depression',
+    'st_slope', 'major_vessels', 'thalassemia'
+]
+
+# Ensemble members; each is saved as models/<name>.pkl
+MODEL_NAMES = ['knn', 'decision_tree', 'naive_bayes', 'svm', 'logistic_regression', 'mlp']
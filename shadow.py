@@ -0,0 +1,149 @@
+"""
+Heart Disease Prediction - Shadow Evaluation
+Author: Your Name
+Date: 2026
+Description: Scores live traffic against a candidate model set without
+touching the response path. The request thread only copies the feature row
+into a bounded queue (dropping it if the queue is full); a background worker
+scores queued rows against the candidate in batches and records per-model
+agreement, risk-level flips and latency. Enabled by pointing
+HEARTGUARD_SHADOW_DIR at a directory laid out like models/.
+"""
+
+import os
+import queue
+import threading
+import time
+from collections import Counter
+
+import numpy as np
+
+from schema import MODEL_NAMES
+
+# ==================== CONFIGURATION ====================
+
+SHADOW_DIR = os.environ.get('HEARTGUARD_SHADOW_DIR')
+QUEUE_SIZE = int(os.environ.get('HEARTGUARD_SHADOW_QUEUE', '1024'))
+BATCH_SIZE = int(os.environ.get('HEARTGUARD_SHADOW_BATCH', '64'))
+
+# ==================== STATE ====================
+
+_queue = queue.Queue(maxsize=QUEUE_SIZE)
+_lock = threading.Lock()
+_candidate = None
+_risk_level = None
+_stats = {
+    'samples': 0,
+    'dropped': 0,
+    'batches': 0,
+    'risk_level_agree': 0,
+    'flips': Counter(),
+    'model_agree': Counter(),
+    'model_seen': Counter(),
+    'live_seconds': 0.0,
+    'candidate_seconds': 0.0,
+}
+
+# ==================== HOT PATH ====================
+
+def submit(features, predictions, risk_level, live_seconds):
+    """Queue one scored request for the candidate; never blocks"""
+    if _candidate is None:
+        return
+    try:
+        _queue.put_nowait((np.array(features[0], copy=True), dict(predictions), risk_level, live_seconds))
+    except queue.Full:
+        with _lock:
+            _stats['dropped'] += 1
+
+# ==================== WORKER ====================
+
+def _next_batch():
+    """Block for one item, then take whatever else is queued up to BATCH_SIZE"""
+    batch = [_queue.get()]
+    while len(batch) < BATCH_SIZE:
+        try:
+            batch.append(_queue.get_nowait())
+        except queue.Empty:
+            break
+    return batch
+
+def _score_batch(batch):
+    features = np.vstack([item[0] for item in batch])
+    started = time.perf_counter()
+    if 'scaler' in _candidate:
+        features = _candidate['scaler'].transform(features)
+    votes = {}
+    # Stays on the worker's one-thread BLAS/OpenMP cap: pool limits are
+    # process-wide, so widening them here would widen live requests too
+    for name in MODEL_NAMES:
+        if name in _candidate:
+            votes[name] = np.asarray(_candidate[name].predict(features)).astype(int)
+    candidate_seconds = time.perf_counter() - started
+    if not votes:
+        return
+
+    with _lock:
+        _stats['batches'] += 1
+        _stats['candidate_seconds'] += candidate_seconds
+        for row, (_, live_votes, live_level, live_seconds) in enumerate(batch):
+            row_votes = {name: int(votes[name][row]) for name in votes}
+            candidate_level, _ = _risk_level(sum(row_votes.values()), len(row_votes))
+            _stats['samples'] += 1
+            _stats['live_seconds'] += live_seconds
+            if candidate_level == live_level:
+                _stats['risk_level_agree'] += 1
+            else:
+                _stats['flips'][f'{live_level}->{candidate_level}'] += 1
+            for name, vote in row_votes.items():
+                if name in live_votes:
+                    _stats['model_seen'][name] += 1
+                    _stats['model_agree'][name] += int(vote == live_votes[name])
+
+def _worker():
+    while True:
+        batch = _next_batch()
+        try:
+            _score_batch(batch)
+        except Exception as e:
+            print(f"[WARNING] Shadow scoring failed: {e}")
+
+def start(candidate_models, risk_level_func):
+    """Begin shadowing live traffic against a loaded candidate model set"""
+    global _candidate, _risk_level
+    if not candidate_models:
+        print("[WARNING] Shadow candidate could not be loaded - shadow mode disabled")
+        return
+    _candidate = candidate_models
+    _risk_level = risk_level_func
+    threading.Thread(target=_worker, name='heartguard-shadow', daemon=True).start()
+    print(f"[OK] Shadow mode: scoring live traffic against {SHADOW_DIR}")
+
+# ==================== REPORT ====================
+
+def report():
+    """Agreement, flip rates and latency of the candidate on live traffic"""
+    with _lock:
+        samples = _stats['samples']
+        return {
+            'enabled': _candidate is not None,
+            'candidate_dir': SHADOW_DIR,
+            'samples': samples,
+            'dropped': _stats['dropped'],
+            'queued': _queue.qsize(),
+            'batches': _stats['batches'],
+            'risk_level_agreement': round(_stats['risk_level_agree'] / samples, 4) if samples else None,
+            'flip_rate': round(1 - _stats['risk_level_agree'] / samples, 4) if samples else None,
+            'flips': dict(_stats['flips']),
+            'model_agreement': {
+                name: round(_stats['model_agree'][name] / seen, 4)
+                for name, seen in _stats['model_seen'].items() if seen
+            },
+            'live_ms_per_request': round(_stats['live_seconds'] * 1000 / samples, 4) if samples else None,
+            'candidate_ms_per_row': round(_stats['candidate_seconds'] * 1000 / samples, 4) if samples else None,
+        }
+
+def summary():
+    """Compact shadow state for the metrics endpoint"""
+    full = report()
+    return {key: full[key] for key in ('enabled', 'samples', 'dropped', 'queued', 'flip_rate')}
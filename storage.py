@@ -0,0 +1,651 @@
+"""
+Heart Disease Prediction - Prediction Storage
+Author: Your Name
+Date: 2026
+Description: Time-partitioned SQLite storage for predictions. Each day or
+month of rows lives in its own database file under database/partitions/
+(predictions_pYYYYMM.db / predictions_pYYYYMMDD.db, each holding one table of
+the same name). Clearing and retention unlink whole files, so dropping a
+partition costs O(partitions) and never walks pages under a write lock that
+inserts wait on. Expired partitions are archived to gzip NDJSON first.
+
+With HEARTGUARD_STORAGE_MODE=dedup each distinct input and its result is
+stored once in partitions/prediction_inputs.db, keyed by a hash, and every
+submission only appends a compact (hash, user, timestamp) row to a
+prediction_events_p* partition. Reads rebuild full rows with a join, so both
+layouts look the same through the helpers below.
+
+Partition files are created complete under a temporary name and linked into
+place, so a partition file always holds its table. Dropping renames the file
+away; the rename is the claim, so concurrent workers never archive or drop
+the same partition twice. Writers hold a shared flock on partitions/.lock
+and droppers an exclusive one for the renames only, so no write connection
+is open on a file while it is dropped. Readers open files read-only and
+take no lock.
+"""
+
+import fcntl
+import gzip
+import hashlib
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from schema import FEATURES
+
+# ==================== CONFIGURATION ====================
+
+# 'month' or 'day'
+PARTITION_BY = os.environ.get('HEARTGUARD_PARTITION_BY', 'month')
+# Partitions older than this many days are archived and dropped (0 = keep forever)
+RETENTION_DAYS = int(os.environ.get('HEARTGUARD_RETENTION_DAYS', '0'))
+# How often each worker checks for expired partitions
+EXPIRY_INTERVAL = int(os.environ.get('HEARTGUARD_EXPIRY_INTERVAL', '3600'))
+
+# 'rows' stores full rows; 'dedup' stores distinct inputs once plus events
+STORAGE_MODE = os.environ.get('HEARTGUARD_STORAGE_MODE', 'rows')
+
+ROW_PREFIX = 'predictions_p'
+EVENT_PREFIX = 'prediction_events_p'
+# New rows go to partitions of the configured layout; reads cover both
+PARTITION_PREFIX = EVENT_PREFIX if STORAGE_MODE == 'dedup' else ROW_PREFIX
+# Rows from the pre-partitioning `predictions` table; sorts before every period
+LEGACY_PARTITION = ROW_PREFIX + '0'
+INPUTS = 'prediction_inputs'
+
+COLUMNS = ['id'] + FEATURES + ['risk_percentage', 'risk_level', 'created_at']
+
+_expiry_lock = threading.Lock()
+_last_expiry_check = 0.0
+
+# ==================== FILES ====================
+
+def partition_dir(db_path):
+    return Path(db_path).parent / 'partitions'
+
+def partition_path(db_path, name):
+    """Database file holding a partition, or the deduplicated inputs"""
+    return partition_dir(db_path) / f'{name}.db'
+
+def connect(path, mode=None):
+    """
+    Open a connection; WAL keeps readers and the archiver off the writers.
+    mode='rw' or 'ro' refuses to create a missing file.
+    """
+    # Always a URI, so the file: names given to ATTACH are parsed as URIs too
+    uri = Path(path).resolve().as_uri() + (f'?mode={mode}' if mode else '')
+    conn = sqlite3.connect(uri, uri=True, timeout=10)
+    if mode != 'ro':
+        conn.execute('PRAGMA journal_mode=WAL')
+    return conn
+
+def _memory():
+    """Scratch connection that partition files are attached to"""
+    return sqlite3.connect('file::memory:', uri=True, timeout=10)
+
+def _attach(conn, path, schema, mode='ro'):
+    conn.execute('ATTACH DATABASE ? AS ' + schema, (f'{Path(path).resolve().as_uri()}?mode={mode}',))
+
+def _unlink(path):
+    for suffix in ('', '-wal', '-shm'):
+        try:
+            os.unlink(f'{path}{suffix}')
+        except FileNotFoundError:
+            pass
+
+@contextmanager
+def partition_lock(db_path, exclusive=False):
+    """Shared lock for writing partition files, exclusive for dropping them"""
+    directory = partition_dir(db_path)
+    directory.mkdir(parents=True, exist_ok=True)
+    fd = os.open(directory / '.lock', os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        yield
+    finally:
+        os.close(fd)
+
+# ==================== PARTITIONS ====================
+
+def partition_for(moment):
+    """Partition holding rows created at `moment`"""
+    fmt = '%Y%m%d' if PARTITION_BY == 'day' else '%Y%m'
+    return PARTITION_PREFIX + moment.strftime(fmt)
+
+def _period(name):
+    """Period suffix of a partition name, e.g. '202610'"""
+    prefix = EVENT_PREFIX if name.startswith(EVENT_PREFIX) else ROW_PREFIX
+    return name[len(prefix):]
+
+def partition_end(name):
+    """First instant after the period covered by a partition, or None for legacy"""
+    period = _period(name)
+    if len(period) == 8:
+        return datetime.strptime(period, '%Y%m%d') + timedelta(days=1)
+    if len(period) == 6:
+        start = datetime.strptime(period, '%Y%m')
+        return (start + timedelta(days=32)).replace(day=1)
+    return None
+
+def list_partitions(db_path):
+    """Partition names of either layout, oldest first"""
+    directory = partition_dir(db_path)
+    names = [
+        path.stem for pattern in (ROW_PREFIX + '[0-9]*.db', EVENT_PREFIX + '[0-9]*.db')
+        for path in directory.glob(pattern)
+    ]
+    return sorted(names, key=lambda name: (_period(name), name))
+
+def _create_inputs_table(conn):
+    conn.execute(f'''
+        CREATE TABLE IF NOT EXISTS {INPUTS} (
+            input_hash BLOB PRIMARY KEY,
+            age INTEGER,
+            sex INTEGER,
+            chest_pain_type INTEGER,
+            resting_blood_pressure INTEGER,
+            cholesterol INTEGER,
+            fasting_blood_sugar INTEGER,
+            resting_ecg INTEGER,
+            max_heart_rate INTEGER,
+            exercise_induced_angina INTEGER,
+            st_depression REAL,
+            st_slope INTEGER,
+            major_vessels INTEGER,
+            thalassemia INTEGER,
+            risk_percentage REAL,
+            risk_level TEXT
+        ) WITHOUT ROWID
+    ''')
+
+def _create_partition_table(conn, name, first_id=0):
+    if name.startswith(EVENT_PREFIX):
+        conn.execute(f'''
+            CREATE TABLE IF NOT EXISTS {name} (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                input_hash BLOB NOT NULL,
+                user TEXT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+    else:
+        conn.execute(f'''
+            CREATE TABLE IF NOT EXISTS {name} (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                age INTEGER,
+                sex INTEGER,
+                chest_pain_type INTEGER,
+                resting_blood_pressure INTEGER,
+                cholesterol INTEGER,
+                fasting_blood_sugar INTEGER,
+                resting_ecg INTEGER,
+                max_heart_rate INTEGER,
+                exercise_induced_angina INTEGER,
+                st_depression REAL,
+                st_slope INTEGER,
+                major_vessels INTEGER,
+                thalassemia INTEGER,
+                risk_percentage REAL,
+                risk_level TEXT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+    conn.execute(f'CREATE INDEX IF NOT EXISTS idx_{name}_created_at ON {name}(created_at DESC)')
+    # Continue ids from the newest partition so ids stay unique across partitions
+    conn.execute('INSERT INTO sqlite_sequence (name, seq) VALUES (?, ?)', (name, first_id))
+
+def _last_id(db_path):
+    """Highest id handed out by the partitions of the newest period"""
+    partitions = list_partitions(db_path)
+    if not partitions:
+        return 0
+    newest = _period(partitions[-1])
+    last = 0
+    for name in partitions:
+        if _period(name) != newest:
+            continue
+        try:
+            conn = connect(partition_path(db_path, name), mode='ro')
+        except sqlite3.OperationalError:
+            continue
+        try:
+            row = conn.execute('SELECT seq FROM sqlite_sequence WHERE name = ?', (name,)).fetchone()
+            last = max(last, row[0] if row else 0)
+        finally:
+            conn.close()
+    return last
+
+def _ensure_file(path, create):
+    """
+    Create a database file complete or not at all: build it under a temporary
+    name, then hard-link it into place (a no-op if another worker won)
+    """
+    if path.exists():
+        return
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=path.stem, suffix='.tmp')
+    os.close(fd)
+    try:
+        conn = connect(tmp)
+        try:
+            create(conn)
+            conn.commit()
+        finally:
+            conn.close()
+        try:
+            os.link(tmp, path)
+        except FileExistsError:
+            pass
+    finally:
+        _unlink(tmp)
+
+def ensure_partition(db_path, name):
+    """Create a partition file if it does not exist yet"""
+    path = partition_path(db_path, name)
+    if not path.exists():
+        first_id = _last_id(db_path)
+        _ensure_file(path, lambda conn: _create_partition_table(conn, name, first_id))
+
+def ensure_inputs(db_path):
+    _ensure_file(partition_path(db_path, INPUTS), _create_inputs_table)
+
+def _drop_partitions(db_path, names):
+    """
+    Remove partition files. Renaming each away is the claim: only one worker
+    succeeds, and the others see the partition as already gone.
+    Returns: the names this call dropped
+    """
+    dropped, claimed = [], []
+    with partition_lock(db_path, exclusive=True):
+        for name in names:
+            path = partition_path(db_path, name)
+            target = f'{path}.dropping-{os.getpid()}-{threading.get_ident()}'
+            try:
+                os.rename(path, target)
+            except FileNotFoundError:
+                continue
+            # The WAL still carries the old name; clear it before a new file can
+            for suffix in ('-wal', '-shm'):
+                try:
+                    os.unlink(f'{path}{suffix}')
+                except FileNotFoundError:
+                    pass
+            dropped.append(name)
+            claimed.append(target)
+    # Freeing the pages of a large file happens outside the lock
+    for target in claimed:
+        _unlink(target)
+    return dropped
+
+def _migrate_table(conn, db_path, table, name, has_sequence):
+    """Move a table of the main database into its own partition file"""
+    columns = [row[1] for row in conn.execute(f'PRAGMA main.table_info({table})')]
+    seq = None
+    if has_sequence:
+        seq = conn.execute('SELECT seq FROM sqlite_sequence WHERE name = ?', (table,)).fetchone()
+    if name == INPUTS:
+        ensure_inputs(db_path)
+    else:
+        first_id = seq[0] if seq else 0
+        _ensure_file(partition_path(db_path, name), lambda c: _create_partition_table(c, name, first_id))
+    _attach(conn, partition_path(db_path, name), 'target', mode='rw')
+    try:
+        conn.execute('BEGIN IMMEDIATE')
+        # Another worker starting up may have moved it already
+        if conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (table,)).fetchone():
+            column_list = ', '.join(columns)
+            conn.execute(f'INSERT OR IGNORE INTO target.{name} ({column_list}) '
+                         f'SELECT {column_list} FROM main.{table}')
+            conn.execute(f'DROP TABLE main.{table}')
+        conn.commit()
+    finally:
+        conn.execute('DETACH DATABASE target')
+
+def init_storage(db_path):
+    """
+    Create the partition directory and the current partition, moving any
+    predictions kept in the main database (the legacy predictions table, or
+    partitions of the earlier single-file layout) into partition files
+    """
+    partition_dir(db_path).mkdir(parents=True, exist_ok=True)
+    conn = connect(db_path)
+    try:
+        has_sequence = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'sqlite_sequence'"
+        ).fetchone()
+        views = conn.execute("SELECT name FROM sqlite_master WHERE type = 'view'").fetchall()
+        for (view,) in views:
+            if view == 'predictions' or view.startswith('predictions_v'):
+                conn.execute(f'DROP VIEW {view}')
+        conn.commit()
+
+        tables = [row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")]
+        for table in tables:
+            if table == 'predictions':
+                name = LEGACY_PARTITION
+            elif table == INPUTS or (table.startswith((ROW_PREFIX, EVENT_PREFIX)) and _period(table).isdigit()):
+                name = table
+            else:
+                continue
+            with partition_lock(db_path):
+                _migrate_table(conn, db_path, table, name, has_sequence)
+            print(f"[OK] Migrated {table} to {partition_path(db_path, name).name}")
+    finally:
+        conn.close()
+    with partition_lock(db_path):
+        ensure_partition(db_path, partition_for(datetime.now()))
+
+# ==================== READ / WRITE ====================
+
+def input_hash(values):
+    """16-byte key for a feature vector and its result"""
+    canonical = []
+    for value in values:
+        try:
+            # 1, 1.0 and "1" are the same input once stored
+            canonical.append(float(value))
+        except (TypeError, ValueError):
+            canonical.append(value)
+    return hashlib.blake2b(json.dumps(canonical).encode('utf-8'), digest_size=16).digest()
+
+def _insert(conn, name, values, created_at, user):
+    if name.startswith(EVENT_PREFIX):
+        key = input_hash(values)
+        placeholders = ', '.join('?' * len(COLUMNS[:-1]))
+        conn.execute(
+            f'INSERT OR IGNORE INTO {INPUTS}.{INPUTS} (input_hash, {", ".join(COLUMNS[1:-1])}) '
+            f'VALUES ({placeholders})',
+            (key, *values)
+        )
+        conn.execute(
+            f'INSERT INTO main.{name} (input_hash, user, created_at) VALUES (?, ?, ?)',
+            (key, user, created_at)
+        )
+    else:
+        placeholders = ', '.join('?' * (len(COLUMNS) - 1))
+        conn.execute(
+            f'INSERT INTO main.{name} ({", ".join(COLUMNS[1:])}) VALUES ({placeholders})',
+            (*values, created_at)
+        )
+
+def insert_prediction(db_path, values, created_at, user=None):
+    """
+    Append one prediction to the partition for created_at
+    values: the 13 features followed by risk_percentage and risk_level
+    """
+    name = partition_for(datetime.fromisoformat(created_at))
+    with partition_lock(db_path):
+        ensure_partition(db_path, name)
+        conn = connect(partition_path(db_path, name), mode='rw')
+        try:
+            if name.startswith(EVENT_PREFIX):
+                ensure_inputs(db_path)
+                _attach(conn, partition_path(db_path, INPUTS), INPUTS, mode='rw')
+            conn.execute('BEGIN IMMEDIATE')
+            _insert(conn, name, values, created_at, user)
+            conn.commit()
+        finally:
+            conn.close()
+    maybe_expire(db_path)
+
+def select_rows(name):
+    """SELECT returning full prediction rows (COLUMNS) from one attached partition"""
+    if name.startswith(EVENT_PREFIX):
+        input_columns = ', '.join(f'i.{column}' for column in COLUMNS[1:-1])
+        return (f'SELECT e.id AS id, {input_columns}, e.created_at AS created_at '
+                f'FROM {name}.{name} e JOIN {INPUTS}.{INPUTS} i ON i.input_hash = e.input_hash')
+    return f'SELECT {", ".join(COLUMNS)} FROM {name}.{name}'
+
+def open_partitions(db_path, names):
+    """
+    Read-only connection with the named partitions attached under their own
+    names (and the inputs, for event partitions)
+    Returns: (conn, attached names); partitions dropped meanwhile are left out
+    """
+    conn = _memory()
+    conn.row_factory = sqlite3.Row
+    attached = []
+    if any(name.startswith(EVENT_PREFIX) for name in names):
+        try:
+            _attach(conn, partition_path(db_path, INPUTS), INPUTS)
+        except sqlite3.OperationalError:
+            names = [name for name in names if not name.startswith(EVENT_PREFIX)]
+    for name in names:
+        try:
+            _attach(conn, partition_path(db_path, name), name)
+        except sqlite3.OperationalError:
+            continue
+        attached.append(name)
+    return conn, attached
+
+def _by_period(db_path):
+    """Partition names grouped by period, oldest period first"""
+    groups = {}
+    for name in list_partitions(db_path):
+        groups.setdefault(_period(name), []).append(name)
+    return list(groups.values())
+
+def _select_period(names):
+    """Rows of one period's partitions; both layouts can share a period"""
+    return ' UNION ALL '.join(select_rows(name) for name in names)
+
+def fetch_recent(db_path, limit):
+    """
+    Newest rows first, reading periods newest-first until limit is met. The
+    partitions of one period are queried together, so rows written after a
+    layout switch sort among those written before it.
+    """
+    rows = []
+    for names in reversed(_by_period(db_path)):
+        conn, attached = open_partitions(db_path, names)
+        try:
+            if attached:
+                rows.extend(conn.execute(
+                    f'SELECT * FROM ({_select_period(attached)}) ORDER BY created_at DESC LIMIT ?',
+                    (limit - len(rows),)
+                ).fetchall())
+        finally:
+            conn.close()
+        if len(rows) >= limit:
+            break
+    return [dict(row) for row in rows]
+
+def iter_rows(db_path):
+    """Every stored prediction, oldest first, one period at a time"""
+    for names in _by_period(db_path):
+        conn, attached = open_partitions(db_path, names)
+        try:
+            if attached:
+                for row in conn.execute(f'SELECT * FROM ({_select_period(attached)}) ORDER BY created_at'):
+                    yield dict(row)
+        finally:
+            conn.close()
+
+def count_rows(db_path):
+    """Total stored predictions"""
+    count = 0
+    for name in list_partitions(db_path):
+        conn, attached = open_partitions(db_path, [name])
+        try:
+            if attached:
+                count += conn.execute(f'SELECT COUNT(*) FROM {name}.{name}').fetchone()[0]
+        finally:
+            conn.close()
+    return count
+
+def clear_all(db_path):
+    """Drop every partition; unlinks O(partitions) files, whatever their size"""
+    count = count_rows(db_path)
+    _drop_partitions(db_path, list_partitions(db_path) + [INPUTS])
+    with partition_lock(db_path):
+        ensure_partition(db_path, partition_for(datetime.now()))
+    return count
+
+# ==================== RETENTION ====================
+
+def archive_dir(db_path):
+    return Path(db_path).parent / 'archive'
+
+def archive_partition(db_path, name, directory):
+    """
+    Write a partition to gzip NDJSON, then drop it. The archive is written to
+    a unique temporary file and only published by the worker whose drop claims
+    the partition.
+    Returns: the archive path, or None if another worker got there first
+    """
+    directory.mkdir(parents=True, exist_ok=True)
+    target = directory / f'{name}.ndjson.gz'
+    fd, tmp = tempfile.mkstemp(dir=directory, prefix=f'{name}.', suffix='.ndjson.gz.tmp')
+    try:
+        conn, attached = open_partitions(db_path, [name])
+        try:
+            if not attached:
+                return None
+            cursor = conn.execute(f'SELECT * FROM ({select_rows(name)}) ORDER BY id')
+            columns = [col[0] for col in cursor.description]
+            with os.fdopen(fd, 'wb') as raw:
+                fd = None
+                with gzip.open(raw, 'wt', encoding='utf-8') as fh:
+                    for row in cursor:
+                        fh.write(json.dumps(dict(zip(columns, row))) + '\n')
+        finally:
+            conn.close()
+        if not _drop_partitions(db_path, [name]):
+            return None
+        os.replace(tmp, target)
+        return target
+    finally:
+        if fd is not None:
+            os.close(fd)
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+
+def _legacy_end(db_path, name):
+    conn, attached = open_partitions(db_path, [name])
+    try:
+        if not attached:
+            return None
+        newest = conn.execute(f'SELECT MAX(created_at) FROM {name}.{name}').fetchone()[0]
+    finally:
+        conn.close()
+    return datetime.fromisoformat(newest) if newest else datetime.min
+
+def expire_partitions(db_path, retention_days=None, now=None):
+    """Archive and drop partitions whose period ended before the retention cutoff"""
+    retention_days = RETENTION_DAYS if retention_days is None else retention_days
+    if retention_days <= 0:
+        return []
+    cutoff = (now or datetime.now()) - timedelta(days=retention_days)
+    current = partition_for(now or datetime.now())
+
+    expired = []
+    for name in list_partitions(db_path):
+        if name == current:
+            continue
+        end = partition_end(name)
+        if end is None:
+            end = _legacy_end(db_path, name)
+        if end is None or end > cutoff:
+            continue
+        archive = archive_partition(db_path, name, archive_dir(db_path))
+        if archive is None:
+            continue
+        expired.append(name)
+        print(f"[OK] Archived partition {name} to {archive.name}")
+    if expired:
+        prune_inputs(db_path)
+    return expired
+
+def prune_inputs(db_path, batch_size=500):
+    """
+    Delete deduplicated inputs no event refers to, in short write batches.
+    The referenced set is collected once into memory without holding any
+    write lock; each batch then only rechecks events written since.
+    """
+    if not partition_path(db_path, INPUTS).exists():
+        return 0
+    conn = _memory()
+    try:
+        conn.execute('CREATE TABLE referenced (input_hash BLOB PRIMARY KEY) WITHOUT ROWID')
+        events = [name for name in list_partitions(db_path) if name.startswith(EVENT_PREFIX)]
+        seen = {}
+        for name in events:
+            try:
+                _attach(conn, partition_path(db_path, name), 'events')
+            except sqlite3.OperationalError:
+                continue
+            try:
+                conn.execute('BEGIN')
+                conn.execute(f'INSERT OR IGNORE INTO main.referenced SELECT input_hash FROM events.{name}')
+                seen[name] = conn.execute(f'SELECT COALESCE(MAX(id), 0) FROM events.{name}').fetchone()[0]
+                conn.commit()
+            finally:
+                conn.execute('DETACH DATABASE events')
+
+        pruned = 0
+        newest = events[-1] if events else None
+        while True:
+            with partition_lock(db_path):
+                try:
+                    _attach(conn, partition_path(db_path, INPUTS), INPUTS, mode='rw')
+                except sqlite3.OperationalError:
+                    return pruned
+                # New events only land in the newest partition or ones created
+                # since the snapshot; their id ranges are cheap to scan
+                attached = [INPUTS]
+                for name in list_partitions(db_path):
+                    if name.startswith(EVENT_PREFIX) and (name not in seen or name == newest):
+                        try:
+                            _attach(conn, partition_path(db_path, name), name)
+                            attached.append(name)
+                        except sqlite3.OperationalError:
+                            continue
+                try:
+                    recheck = ' '.join(
+                        f'AND input_hash NOT IN (SELECT input_hash FROM {name}.{name} '
+                        f'WHERE id > {seen.get(name, 0)})'
+                        for name in attached[1:]
+                    )
+                    # Deferred, so only the inputs file is write-locked
+                    conn.execute('BEGIN')
+                    cursor = conn.execute(f'''
+                        DELETE FROM {INPUTS}.{INPUTS} WHERE input_hash IN (
+                            SELECT input_hash FROM {INPUTS}.{INPUTS}
+                            WHERE input_hash NOT IN (SELECT input_hash FROM main.referenced)
+                            {recheck}
+                            LIMIT ?
+                        )
+                    ''', (batch_size,))
+                    conn.commit()
+                finally:
+                    for name in attached:
+                        conn.execute(f'DETACH DATABASE {name}')
+            pruned += cursor.rowcount
+            if cursor.rowcount < batch_size:
+                return pruned
+    finally:
+        conn.close()
+
+def maybe_expire(db_path):
+    """Run expiry in the background at most once per EXPIRY_INTERVAL"""
+    global _last_expiry_check
+    if RETENTION_DAYS <= 0:
+        return
+    with _expiry_lock:
+        if time.monotonic() - _last_expiry_check < EXPIRY_INTERVAL:
+            return
+        _last_expiry_check = time.monotonic()
+
+    def run():
+        try:
+            expire_partitions(db_path)
+        except Exception as e:
+            print(f"[WARNING] Partition expiry failed: {e}")
+
+    threading.Thread(target=run, name='heartguard-expiry', daemon=True).start()
@@ -0,0 +1,123 @@
+"""
+Heart Disease Prediction - Admission Tests
+Author: Your Name
+Date: 2026
+Description: Lane shedding, Retry-After hints, the per-client token bucket
+and X-Forwarded-For handling.
+"""
+
+import asyncio
+import sys
+import threading
+import time
+from pathlib import Path
+
+from flask import Flask
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import admission
+
+def test_lane_sheds_once_the_queue_is_full():
+    lane = admission.Lane('test', concurrency=1, queue_size=1, target_ms=2000)
+    started, _ = lane.acquire()
+    assert started is not None
+
+    # The one queue place is taken by a waiting thread
+    waiter = threading.Thread(target=lambda: lane.release(lane.acquire()[0]))
+    waiter.start()
+    while lane.waiting == 0:
+        time.sleep(0.001)
+
+    shed, retry_after = lane.acquire()
+    assert shed is None and retry_after >= 1
+    lane.release(started)
+    waiter.join(5)
+    assert lane.snapshot()['shed'] == 1 and lane.active == 0
+
+def test_lane_sheds_when_the_estimated_wait_exceeds_the_target():
+    lane = admission.Lane('test', concurrency=1, queue_size=10, target_ms=100)
+    lane.service_time = 3.0
+    started, _ = lane.acquire()
+    shed, retry_after = lane.acquire()
+    assert shed is None and retry_after == 3
+    lane.release(started)
+
+def test_lane_gives_up_after_waiting_its_target():
+    lane = admission.Lane('test', concurrency=1, queue_size=10, target_ms=50)
+    lane.service_time = 0.01
+    started, _ = lane.acquire()
+    began = time.monotonic()
+    shed, retry_after = lane.acquire()
+    assert shed is None and retry_after >= 1
+    assert 0.04 < time.monotonic() - began < 1
+    lane.release(started)
+
+def test_lower_priority_lane_yields_while_the_priority_lane_queues():
+    predict = admission.Lane('predict', concurrency=1, queue_size=10, target_ms=2000)
+    history = admission.Lane('history', concurrency=4, queue_size=10, target_ms=2000, yield_to=predict)
+    predict.waiting = 1
+    shed, retry_after = history.acquire()
+    assert shed is None and retry_after >= 1
+
+def test_async_waiter_is_handed_the_released_slot():
+    lane = admission.Lane('test', concurrency=1, queue_size=10, target_ms=2000)
+
+    async def scenario():
+        first, _ = await lane.acquire_async()
+        second = asyncio.ensure_future(lane.acquire_async())
+        await asyncio.sleep(0.01)
+        assert lane.waiting == 1
+        lane.release(first)
+        started, _ = await second
+        assert started is not None and lane.active == 1
+        lane.release(started)
+
+    asyncio.run(scenario())
+    assert lane.active == 0 and lane.waiting == 0
+
+def test_token_bucket_limits_each_client_separately():
+    bucket = admission.TokenBucket(rate=1.0, burst=2, max_clients=10)
+    assert bucket.take('ip:a') is None
+    assert bucket.take('ip:a') is None
+    assert bucket.take('ip:a') == 1
+    assert bucket.take('ip:b') is None
+    assert bucket.snapshot()['limited'] == 1
+
+def test_token_bucket_forgets_the_oldest_clients():
+    bucket = admission.TokenBucket(rate=1.0, burst=1, max_clients=2)
+    for key in ('ip:a', 'ip:b', 'ip:c'):
+        bucket.take(key)
+    assert bucket.snapshot()['clients'] == 2
+    # 'ip:a' was evicted, so it starts over with a full burst
+    assert bucket.take('ip:a') is None
+
+def test_client_address_trusts_only_configured_proxy_hops(monkeypatch):
+    monkeypatch.setattr(admission, 'TRUSTED_PROXIES', 0)
+    assert admission.client_address('10.0.0.1', 'spoofed, 1.2.3.4') == '10.0.0.1'
+    monkeypatch.setattr(admission, 'TRUSTED_PROXIES', 1)
+    assert admission.client_address('10.0.0.1', 'spoofed, 1.2.3.4') == '1.2.3.4'
+    monkeypatch.setattr(admission, 'TRUSTED_PROXIES', 3)
+    assert admission.client_address('10.0.0.1', '1.2.3.4') == '10.0.0.1'
+
+def test_admit_returns_429_and_503_with_retry_after(monkeypatch):
+    monkeypatch.setattr(admission, 'CLIENT_BUCKET', admission.TokenBucket(rate=1.0, burst=1, max_clients=10))
+    lane = admission.Lane('test', concurrency=1, queue_size=0, target_ms=100)
+    app = Flask(__name__)
+
+    @app.route('/limited')
+    @admission.admit(lane, rate_limited=True)
+    def limited():
+        return 'ok'
+
+    client = app.test_client()
+    assert client.get('/limited').status_code == 200
+    response = client.get('/limited')
+    assert response.status_code == 429 and response.headers['Retry-After'] == '1'
+
+    monkeypatch.setattr(admission, 'CLIENT_BUCKET', admission.TokenBucket(rate=0, burst=1, max_clients=10))
+    started, _ = lane.acquire()
+    response = client.get('/limited')
+    assert response.status_code == 503 and int(response.headers['Retry-After']) >= 1
+    lane.release(started)
+    assert client.get('/limited').status_code == 200
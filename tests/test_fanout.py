@@ -0,0 +1,90 @@
+"""
+Heart Disease Prediction - Fan-out Tests
+Author: Your Name
+Date: 2026
+Description: Per-model deadlines, failures and straggler skipping in the
+parallel model fan-out.
+"""
+
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import fanout
+
+class Model:
+    def __init__(self, vote=1, delay=0.0, error=None, release=None):
+        self.vote, self.delay, self.error, self.release = vote, delay, error, release
+
+    def predict(self, features):
+        if self.release is not None:
+            self.release.wait(5)
+        time.sleep(self.delay)
+        if self.error:
+            raise self.error
+        return [self.vote]
+
+@pytest.fixture(autouse=True)
+def fresh_fanout(monkeypatch):
+    monkeypatch.setattr(fanout, '_pools', {})
+    monkeypatch.setattr(fanout, '_stragglers', {})
+    monkeypatch.setattr(fanout, '_stats', {'requests': 0, 'skipped': {}, 'timed_out': {}})
+    monkeypatch.setattr(fanout, 'WORKERS', 1)
+    monkeypatch.setattr(fanout, 'MAX_STRAGGLERS', 1)
+
+def _timed(*args, **kwargs):
+    started = time.perf_counter()
+    result = fanout.predict_all(*args, **kwargs)
+    return result, time.perf_counter() - started
+
+def test_slow_and_failing_models_are_skipped_within_the_deadline():
+    release = threading.Event()
+    models = {'fast': Model(vote=1), 'slow': Model(release=release), 'broken': Model(error=ValueError('x'))}
+    try:
+        (predictions, skipped), elapsed = _timed(models, ['fast', 'slow', 'broken'], None, timeout_ms=100)
+    finally:
+        release.set()
+    assert predictions == {'fast': 1}
+    assert skipped == ['slow', 'broken']
+    assert elapsed < 0.5
+    assert fanout.snapshot()['timed_out'] == {'slow': 1}
+
+def test_straggler_makes_later_requests_skip_the_model_until_it_finishes():
+    release = threading.Event()
+    models = {'fast': Model(vote=0), 'slow': Model(release=release)}
+    fanout.predict_all(models, ['fast', 'slow'], None, timeout_ms=50)
+    assert fanout.snapshot()['stragglers'] == {'slow': 1}
+
+    (predictions, skipped), elapsed = _timed(models, ['fast', 'slow'], None, timeout_ms=1000)
+    assert skipped == ['slow'] and predictions == {'fast': 0}
+    assert elapsed < 0.5
+
+    release.set()
+    deadline = time.monotonic() + 5
+    while fanout.snapshot()['stragglers'] and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert fanout.snapshot()['stragglers'] == {}
+    predictions, skipped = fanout.predict_all(models, ['fast', 'slow'], None, timeout_ms=1000)
+    assert skipped == [] and predictions == {'fast': 0, 'slow': 1}
+
+def test_time_queued_behind_a_busy_pool_counts_against_the_deadline(monkeypatch):
+    monkeypatch.setattr(fanout, 'MAX_STRAGGLERS', 10)
+    models = {'slow': Model(delay=0.3)}
+    results = []
+
+    def request():
+        results.append(_timed(models, ['slow'], None, timeout_ms=400))
+
+    threads = [threading.Thread(target=request) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    # One worker: the second call waits 0.3 s, then would need 0.3 s more
+    assert all(elapsed < 0.55 for _, elapsed in results)
+    assert sorted(len(skipped) for (_, skipped), _ in results) == [0, 1]
@@ -0,0 +1,77 @@
+"""
+Heart Disease Prediction - Precision Tests
+Author: Your Name
+Date: 2026
+Description: Float32 predictors against their sklearn originals, and the
+agreement gate that decides whether they replace them.
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+from sklearn.neighbors import KNeighborsClassifier
+from sklearn.preprocessing import StandardScaler
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import precision
+from schema import FEATURES
+
+def _data(rows=200, seed=0):
+    rng = np.random.default_rng(seed)
+    X = rng.normal(size=(rows, len(FEATURES)))
+    y = (X[:, 0] + X[:, 1] > 0).astype(int)
+    return X, y
+
+def _fresh_state(monkeypatch):
+    monkeypatch.setattr(precision, '_state', {
+        'float32': False, 'converted': [], 'agreement': {}, 'memory_before': {}, 'memory': {}
+    })
+    monkeypatch.setattr(precision, 'FLOAT32', True)
+
+def _validation_file(tmp_path, X):
+    path = tmp_path / 'heart.csv'
+    lines = [','.join(FEATURES + ['target'])]
+    lines += [','.join(str(value) for value in row) + ',0' for row in X]
+    path.write_text('\n'.join(lines) + '\n')
+    return path
+
+def test_float32_knn_matches_sklearn_brute_force():
+    X, y = _data()
+    knn = KNeighborsClassifier(n_neighbors=5, algorithm='brute').fit(X[:150], y[:150])
+    assert precision.Float32KNN.supports(knn)
+    lean = precision.Float32KNN(knn)
+    assert np.array_equal(lean.predict(X[150:]), knn.predict(X[150:]))
+
+def test_knn_with_a_fitted_tree_is_not_converted():
+    X, y = _data()
+    knn = KNeighborsClassifier(n_neighbors=5, algorithm='kd_tree').fit(X, y)
+    assert precision.to_float32('knn', knn) is None
+
+def test_agreement_gate_keeps_float64_when_lean_model_disagrees(tmp_path, monkeypatch):
+    _fresh_state(monkeypatch)
+    X, y = _data()
+    scaler = StandardScaler().fit(X)
+    knn = KNeighborsClassifier(n_neighbors=5, algorithm='brute').fit(scaler.transform(X), y)
+
+    class Flipped:
+        def predict(self, X):
+            return 1 - knn.predict(X)
+
+    monkeypatch.setattr(precision, 'to_float32', lambda name, model: Flipped())
+    models = precision.prepare_models({'knn': knn, 'scaler': scaler}, _validation_file(tmp_path, X))
+    assert models['knn'] is knn
+    assert precision.snapshot()['float32'] is False
+    assert precision.snapshot()['converted'] == []
+
+def test_agreement_gate_swaps_in_agreeing_lean_model(tmp_path, monkeypatch):
+    _fresh_state(monkeypatch)
+    X, y = _data()
+    scaler = StandardScaler().fit(X)
+    knn = KNeighborsClassifier(n_neighbors=5, algorithm='brute').fit(scaler.transform(X), y)
+
+    models = precision.prepare_models({'knn': knn, 'scaler': scaler}, _validation_file(tmp_path, X))
+    assert isinstance(models['knn'], precision.Float32KNN)
+    assert precision.snapshot()['converted'] == ['knn']
+    assert precision.snapshot()['agreement']['knn'] >= precision.MIN_AGREEMENT
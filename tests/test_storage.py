@@ -0,0 +1,118 @@
+"""
+Heart Disease Prediction - Storage Tests
+Author: Your Name
+Date: 2026
+Description: Regression tests for the time-partitioned prediction storage.
+"""
+
+import sqlite3
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import storage
+
+VALUES = [63, 1, 3, 145, 233, 1, 0, 150, 0, 2.3, 0, 0, 1, 42.0, 'Medium']
+
+def test_reads_span_more_than_500_partitions(tmp_path, monkeypatch):
+    monkeypatch.setattr(storage, 'PARTITION_BY', 'day')
+    monkeypatch.setattr(storage, 'RETENTION_DAYS', 0)
+    db_path = tmp_path / 'predictions.db'
+    storage.init_storage(db_path)
+
+    start = datetime(2024, 1, 1, 12, 0, 0)
+    days = 520
+    for day in range(days):
+        created_at = (start + timedelta(days=day)).isoformat(sep=' ')
+        storage.insert_prediction(db_path, VALUES, created_at)
+
+    assert len(storage.list_partitions(db_path)) > 500
+    assert storage.count_rows(db_path) == days
+    assert len(list(storage.iter_rows(db_path))) == days
+
+    newest = storage.fetch_recent(db_path, 3)
+    assert [row['created_at'][:10] for row in newest] == [
+        (start + timedelta(days=day)).strftime('%Y-%m-%d') for day in (days - 1, days - 2, days - 3)
+    ]
+
+def _dedup_storage(tmp_path, monkeypatch):
+    monkeypatch.setattr(storage, 'STORAGE_MODE', 'dedup')
+    monkeypatch.setattr(storage, 'PARTITION_PREFIX', storage.EVENT_PREFIX)
+    monkeypatch.setattr(storage, 'PARTITION_BY', 'month')
+    db_path = tmp_path / 'predictions.db'
+    storage.init_storage(db_path)
+    return db_path
+
+def _inputs(db_path):
+    conn = sqlite3.connect(storage.partition_path(db_path, storage.INPUTS))
+    try:
+        return conn.execute('SELECT COUNT(*) FROM prediction_inputs').fetchone()[0]
+    finally:
+        conn.close()
+
+def test_expiry_prunes_inputs_only_old_events_refer_to(tmp_path, monkeypatch):
+    db_path = _dedup_storage(tmp_path, monkeypatch)
+    shared = VALUES
+    old_only = VALUES[:-2] + [10.0, 'Low']
+    storage.insert_prediction(db_path, shared, '2024-01-15 10:00:00')
+    storage.insert_prediction(db_path, old_only, '2024-01-15 11:00:00')
+    storage.insert_prediction(db_path, shared, '2024-03-15 10:00:00')
+    assert _inputs(db_path) == 2
+
+    expired = storage.expire_partitions(db_path, retention_days=30, now=datetime(2024, 3, 20))
+    assert expired == [storage.EVENT_PREFIX + '202401']
+    assert _inputs(db_path) == 1
+
+def test_prune_removes_everything_without_event_partitions(tmp_path, monkeypatch):
+    db_path = _dedup_storage(tmp_path, monkeypatch)
+    storage.insert_prediction(db_path, VALUES, '2024-01-15 10:00:00')
+    storage._drop_partitions(db_path, storage.list_partitions(db_path))
+    assert storage.prune_inputs(db_path) == 1
+    assert _inputs(db_path) == 0
+
+def test_migrates_tables_of_the_single_file_layout(tmp_path):
+    db_path = tmp_path / 'predictions.db'
+    conn = sqlite3.connect(db_path)
+    columns = ', '.join(storage.COLUMNS[1:])
+    conn.execute(f'CREATE TABLE predictions (id INTEGER PRIMARY KEY AUTOINCREMENT, {columns})')
+    conn.execute(f'INSERT INTO predictions ({columns}) VALUES ({", ".join("?" * len(storage.COLUMNS[1:]))})',
+                 (*VALUES, '2020-01-01 00:00:00'))
+    conn.commit()
+    conn.close()
+
+    storage.init_storage(db_path)
+    storage.insert_prediction(db_path, VALUES, datetime.now().isoformat())
+    assert storage.LEGACY_PARTITION in storage.list_partitions(db_path)
+    assert [row['id'] for row in storage.iter_rows(db_path)] == [1, 2]
+
+def test_archive_is_published_by_one_claimant_only(tmp_path, monkeypatch):
+    monkeypatch.setattr(storage, 'PARTITION_BY', 'month')
+    db_path = tmp_path / 'predictions.db'
+    storage.init_storage(db_path)
+    storage.insert_prediction(db_path, VALUES, '2024-01-15 10:00:00')
+    name = storage.ROW_PREFIX + '202401'
+
+    first = storage.archive_partition(db_path, name, tmp_path / 'archive')
+    second = storage.archive_partition(db_path, name, tmp_path / 'archive')
+    assert first is not None and second is None
+    assert list((tmp_path / 'archive').iterdir()) == [first]
+    assert name not in storage.list_partitions(db_path)
+
+def test_fetch_recent_orders_across_layouts_within_a_period(tmp_path, monkeypatch):
+    monkeypatch.setattr(storage, 'PARTITION_BY', 'month')
+    db_path = tmp_path / 'predictions.db'
+    storage.init_storage(db_path)
+    for minute in range(5):
+        storage.insert_prediction(db_path, VALUES, f'2024-01-15 10:0{minute}:00')
+
+    monkeypatch.setattr(storage, 'STORAGE_MODE', 'dedup')
+    monkeypatch.setattr(storage, 'PARTITION_PREFIX', storage.EVENT_PREFIX)
+    storage.insert_prediction(db_path, VALUES, '2024-01-15 11:00:00')
+
+    newest = storage.fetch_recent(db_path, 3)
+    assert [row['created_at'] for row in newest] == [
+        '2024-01-15 11:00:00', '2024-01-15 10:04:00', '2024-01-15 10:03:00'
+    ]
+    assert len(list(storage.iter_rows(db_path))) == 6
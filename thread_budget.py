@@ -0,0 +1,97 @@
+"""
+Heart Disease Prediction - CPU Thread Budget
+Author: Your Name
+Date: 2026
+Description: Caps the BLAS/OpenMP thread pools used by numpy and scikit-learn
+at one thread per process, so that server workers and their request threads
+together do not oversubscribe the host. threadpoolctl limits are
+process-wide, so the cap is never widened for individual calls: with
+threaded workers that would widen every concurrent request too. The detected
+cores and worker count are reported alongside the live pool sizes.
+"""
+
+import os
+import shlex
+import sys
+
+from threadpoolctl import threadpool_info, threadpool_limits
+
+# ==================== DETECTION ====================
+
+def detect_cores():
+    """Number of cores this process may run on"""
+    override = os.environ.get('HEARTGUARD_CPU_CORES')
+    if override:
+        return max(1, int(override))
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+def _parse_workers(args):
+    """Extract the value of -w/--workers from a gunicorn or uvicorn argument list"""
+    for i, arg in enumerate(args):
+        if arg in ('-w', '--workers') and i + 1 < len(args):
+            return args[i + 1]
+        if arg.startswith('--workers='):
+            return arg.split('=', 1)[1]
+        if arg.startswith('-w') and arg[2:].isdigit():
+            return arg[2:]
+    return None
+
+def _server_name():
+    """'gunicorn' or 'uvicorn' when this process was started by one, else None"""
+    # `uvicorn ...` runs a console script; `python -m uvicorn` runs uvicorn/__main__.py
+    launcher = os.path.abspath(sys.argv[0]) if sys.argv and sys.argv[0] else ''
+    for server in ('gunicorn', 'uvicorn'):
+        if server in os.path.basename(launcher) or os.path.basename(os.path.dirname(launcher)) == server:
+            return server
+    return None
+
+def detect_workers():
+    """
+    Number of server worker processes sharing this host
+    Returns: (workers, source) where source is None if it had to be guessed
+    """
+    server = _server_name()
+    candidates = [
+        ('HEARTGUARD_WORKERS', os.environ.get('HEARTGUARD_WORKERS')),
+        ('GUNICORN_CMD_ARGS', _parse_workers(shlex.split(os.environ.get('GUNICORN_CMD_ARGS', '')))),
+        (f'{server} --workers', _parse_workers(sys.argv[1:]) if server else None),
+        # Also uvicorn's default for --workers
+        ('WEB_CONCURRENCY', os.environ.get('WEB_CONCURRENCY')),
+    ]
+    for source, value in candidates:
+        if value and str(value).isdigit() and int(value) > 0:
+            return int(value), source
+    return 1, None
+
+CORES = detect_cores()
+WORKERS, WORKERS_SOURCE = detect_workers()
+
+# ==================== BUDGET ====================
+
+_state = {'active_limit': None}
+
+def apply_worker_budget():
+    """Cap every loaded BLAS/OpenMP pool to one thread for this worker"""
+    threadpool_limits(limits=1)
+    _state['active_limit'] = 1
+    print(f"[OK] Thread budget: {CORES} cores / {WORKERS} workers -> 1 BLAS/OpenMP thread per worker")
+
+def snapshot():
+    """Current budget and pool state for the metrics endpoint"""
+    return {
+        'cores': CORES,
+        'workers': WORKERS,
+        'workers_source': WORKERS_SOURCE,
+        'active_limit': _state['active_limit'],
+        'pools': [
+            {
+                'user_api': pool.get('user_api'),
+                'internal_api': pool.get('internal_api'),
+                'num_threads': pool.get('num_threads'),
+            }
+            for pool in threadpool_info()
+        ],
+    }
@@ -24,6 +24,10 @@ import os
 from pathlib import Path
 import warnings
 
+import drift
+import knn_index
+import tuning
+
 warnings.filterwarnings('ignore')
 
 # ==================== CONFIGURATION ====================
@@ -112,6 +116,22 @@ X_test_scaled = scaler.transform(X_test)
 joblib.dump(scaler, MODELS_DIR / 'scaler.pkl')
 print("  [OK] Scaler fitted and saved")
 
+# ==================== HYPERPARAMETER SEARCH ====================
+
+tuned = {}
+if tuning.BUDGET_S > 0:
+    print(f"\n[STEP] Step 5b: Hyperparameter search ({tuning.BUDGET_S:.0f}s budget)...")
+    tuned = tuning.search_all({
+        'knn': KNeighborsClassifier(n_neighbors=5, metric='euclidean'),
+        'decision_tree': DecisionTreeClassifier(max_depth=10, random_state=RANDOM_STATE),
+        'naive_bayes': GaussianNB(),
+        # Probability calibration only matters for the final fit
+        'svm': SVC(kernel='rbf', random_state=RANDOM_STATE),
+        'logistic_regression': LogisticRegression(max_iter=1000, random_state=RANDOM_STATE),
+        'mlp': MLPClassifier(hidden_layer_sizes=(100, 50), max_iter=1000,
+                             random_state=RANDOM_STATE, early_stopping=True),
+    }, X_train_scaled, y_train)
+
 # ==================== MODEL TRAINING ====================
 
 print("\n[STEP] Step 6: Training models...")
@@ -121,7 +141,9 @@ results = []
 
 # 1. K-Nearest Neighbor
 print("\n  [1]  K-Nearest Neighbor (KNN)")
-knn = KNeighborsClassifier(n_neighbors=5, metric='euclidean')
+knn = KNeighborsClassifier(n_neighbors=5, metric='euclidean',
+                           algorithm=knn_index.ALGORITHM, leaf_size=knn_index.LEAF_SIZE)
+knn.set_params(**tuned.get('knn', {}))
 knn.fit(X_train_scaled, y_train)
 models['knn'] = knn
 y_pred_knn = knn.predict(X_test_scaled)
@@ -132,6 +154,7 @@ results.append({'model': 'KNN', 'accuracy': acc_knn})
 # 2. Decision Tree
 print("\n  [2]  Decision Tree")
 dt = DecisionTreeClassifier(max_depth=10, random_state=RANDOM_STATE)
+dt.set_params(**tuned.get('decision_tree', {}))
 dt.fit(X_train_scaled, y_train)
 models['decision_tree'] = dt
 y_pred_dt = dt.predict(X_test_scaled)
@@ -142,6 +165,7 @@ results.append({'model': 'Decision Tree', 'accuracy': acc_dt})
 # 3. Naive Bayes
 print("\n  [3]  Naive Bayes")
 nb = GaussianNB()
+nb.set_params(**tuned.get('naive_bayes', {}))
 nb.fit(X_train_scaled, y_train)
 models['naive_bayes'] = nb
 y_pred_nb = nb.predict(X_test_scaled)
@@ -152,6 +176,7 @@ results.append({'model': 'Naive Bayes', 'accuracy': acc_nb})
 # 4. Support Vector Machine
 print("\n  [4]  Support Vector Machine (SVM)")
 svm = SVC(kernel='rbf', random_state=RANDOM_STATE, probability=True)
+svm.set_params(**tuned.get('svm', {}))
 svm.fit(X_train_scaled, y_train)
 models['svm'] = svm
 y_pred_svm = svm.predict(X_test_scaled)
@@ -162,6 +187,7 @@ results.append({'model': 'SVM', 'accuracy': acc_svm})
 # 5. Logistic Regression
 print("\n  [5]  Logistic Regression")
 lr = LogisticRegression(max_iter=1000, random_state=RANDOM_STATE)
+lr.set_params(**tuned.get('logistic_regression', {}))
 lr.fit(X_train_scaled, y_train)
 models['logistic_regression'] = lr
 y_pred_lr = lr.predict(X_test_scaled)
@@ -173,6 +199,7 @@ results.append({'model': 'Logistic Regression', 'accuracy': acc_lr})
 print("\n  [6]  Multi-Layer Perceptron (MLP)")
 mlp = MLPClassifier(hidden_layer_sizes=(100, 50), max_iter=1000, 
                     random_state=RANDOM_STATE, early_stopping=True)
+mlp.set_params(**tuned.get('mlp', {}))
 mlp.fit(X_train_scaled, y_train)
 models['mlp'] = mlp
 y_pred_mlp = mlp.predict(X_test_scaled)
@@ -244,6 +271,22 @@ for model_name, model in models.items():
     joblib.dump(model, filepath)
     print(f"  [OK] {model_name}.pkl saved")
 
+# knn.pkl already holds the fitted tree; record its recall against exact search
+knn_report = knn_index.evaluate_index(knn, X_train_scaled, X_test_scaled)
+joblib.dump(knn_report, MODELS_DIR / knn_index.REPORT_FILE)
+print(f"  [OK] {knn_index.REPORT_FILE} saved ({knn_report['algorithm']}, "
+      f"recall {knn_report['recall']:.4f}, "
+      f"single query {knn_report['single_ms']:.3f} ms vs {knn_report['single_brute_ms']:.3f} ms brute)")
+
+# Reference statistics for the live input drift monitor: feature statistics
+# from the training rows, vote rates from the held-out test rows
+drift_reference = drift.build_reference(
+    X_train.values,
+    {model_name: model.predict(X_test_scaled) for model_name, model in models.items()}
+)
+joblib.dump(drift_reference, MODELS_DIR / drift.REFERENCE_FILE)
+print(f"  [OK] {drift.REFERENCE_FILE} saved")
+
 # ==================== SUMMARY ====================
 
 print("\n" + "=" * 70)
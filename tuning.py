@@ -0,0 +1,162 @@
+"""
+Heart Disease Prediction - Hyperparameter Search
+Author: Your Name
+Date: 2026
+Description: Budgeted successive-halving search (scikit-learn's
+HalvingRandomSearchCV) over each model's hyperparameters, run in parallel
+across cores. Candidates are ranked on a combined objective: cross-validated
+accuracy minus a penalty per millisecond of single-row inference latency,
+so cheaper-to-serve models win ties. Used by train_models.py when
+HEARTGUARD_TUNE_BUDGET is set.
+"""
+
+import math
+import os
+import time
+import warnings
+
+import numpy as np
+from scipy.stats import loguniform
+from sklearn.base import clone
+# Successive halving is still experimental in scikit-learn
+from sklearn.experimental import enable_halving_search_cv  # noqa: F401
+from sklearn.metrics import accuracy_score
+from sklearn.model_selection import HalvingRandomSearchCV
+
+# ==================== CONFIGURATION ====================
+
+# Wall-clock seconds for the whole search (0 = keep the hard-coded defaults)
+BUDGET_S = float(os.environ.get('HEARTGUARD_TUNE_BUDGET', '0'))
+# Accuracy points given up per millisecond of single-row latency
+LATENCY_WEIGHT = float(os.environ.get('HEARTGUARD_TUNE_LATENCY_WEIGHT', '0.01'))
+N_JOBS = int(os.environ.get('HEARTGUARD_TUNE_JOBS', '-1'))
+CV_FOLDS = 5
+FACTOR = 3
+MAX_CANDIDATES = 243
+# Per-evaluation scheduling overhead of the joblib workers
+DISPATCH_S = 0.005
+
+SEARCH_SPACES = {
+    # Odd k only; weights stay uniform, the only voting float32 KNN supports
+    'knn': {
+        'n_neighbors': list(range(3, 32, 2)),
+    },
+    'decision_tree': {
+        'max_depth': [3, 4, 5, 6, 8, 10, 12, 16, None],
+        'min_samples_leaf': [1, 2, 4, 8, 16],
+        'criterion': ['gini', 'entropy'],
+    },
+    'naive_bayes': {
+        'var_smoothing': loguniform(1e-12, 1e-6),
+    },
+    # RBF only, which the float32 inference path depends on
+    'svm': {
+        'C': loguniform(1e-1, 1e2),
+        'gamma': ['scale', 'auto', 1e-3, 3e-3, 1e-2, 3e-2, 1e-1, 3e-1],
+    },
+    'logistic_regression': {
+        'C': loguniform(1e-3, 1e2),
+    },
+    'mlp': {
+        'hidden_layer_sizes': [(32,), (64,), (100,), (32, 16), (64, 32), (100, 50)],
+        'alpha': loguniform(1e-5, 1e-2),
+        'learning_rate_init': [1e-3, 3e-3, 1e-2],
+    },
+}
+
+# ==================== OBJECTIVE ====================
+
+def single_row_latency_ms(estimator, X, repeats=5):
+    """Median latency of predicting one row, as the API does"""
+    row = X[:1]
+    timings = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        estimator.predict(row)
+        timings.append((time.perf_counter() - started) * 1000)
+    return float(np.median(timings))
+
+def objective(estimator, X, y):
+    """Accuracy minus LATENCY_WEIGHT per ms of single-row latency"""
+    accuracy = accuracy_score(y, estimator.predict(X))
+    return accuracy - LATENCY_WEIGHT * single_row_latency_ms(estimator, X)
+
+# ==================== SEARCH ====================
+
+def _parallelism():
+    if N_JOBS < 0:
+        return os.cpu_count() or 1
+    return max(1, N_JOBS)
+
+def estimated_seconds(n_candidates, fit_seconds, score_seconds):
+    """
+    Wall-clock estimate for a halving search. With min_resources='exhaust'
+    every round costs about one full-data fit per CV fold, and candidates
+    shrink geometrically, so about 1.5 * n candidate evaluations are scored.
+    """
+    rounds = 1 + math.ceil(math.log(n_candidates, FACTOR))
+    work = rounds * fit_seconds + 1.5 * n_candidates * (score_seconds + DISPATCH_S)
+    return CV_FOLDS * work / _parallelism()
+
+def candidates_for_budget(fit_seconds, score_seconds, budget_seconds):
+    """Largest power of FACTOR candidates whose search fits in the budget"""
+    n_candidates = FACTOR
+    while (n_candidates * FACTOR <= MAX_CANDIDATES and
+           estimated_seconds(n_candidates * FACTOR, fit_seconds, score_seconds) <= budget_seconds):
+        n_candidates *= FACTOR
+    return n_candidates
+
+def search(name, estimator, X, y, budget_seconds, random_state=42):
+    """Successive-halving search for one model; returns (best_params, report)"""
+    started = time.perf_counter()
+    probe = clone(estimator).fit(X, y)
+    fit_seconds = time.perf_counter() - started
+    objective(probe, X, y)
+    score_seconds = time.perf_counter() - started - fit_seconds
+    n_candidates = candidates_for_budget(
+        fit_seconds, score_seconds, budget_seconds - fit_seconds - score_seconds
+    )
+
+    searcher = HalvingRandomSearchCV(
+        estimator, SEARCH_SPACES[name], n_candidates=n_candidates, factor=FACTOR,
+        resource='n_samples', min_resources='exhaust', cv=CV_FOLDS, scoring=objective,
+        refit=True, n_jobs=N_JOBS, random_state=random_state
+    )
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        searcher.fit(X, y)
+
+    best = searcher.best_estimator_
+    return searcher.best_params_, {
+        'candidates': n_candidates,
+        'rounds': int(searcher.n_iterations_),
+        'objective': round(float(searcher.best_score_), 4),
+        'latency_ms': round(single_row_latency_ms(best, X), 4),
+        'seconds': round(time.perf_counter() - started, 2),
+    }
+
+def search_all(estimators, X, y, budget_seconds=BUDGET_S):
+    """
+    Search every model in turn, sharing the wall-clock budget between the
+    models still to go. Models whose search fails keep their defaults.
+    """
+    deadline = time.perf_counter() + budget_seconds
+    best_params = {}
+    names = [name for name in estimators if name in SEARCH_SPACES]
+    for i, name in enumerate(names):
+        remaining = deadline - time.perf_counter()
+        if remaining <= 0:
+            print(f"  [WARNING] Budget exhausted - {name} keeps its defaults")
+            continue
+        share = remaining / (len(names) - i)
+        try:
+            params, report = search(name, estimators[name], X, y, share)
+        except ValueError as e:
+            # Too few samples for the CV folds and halving rounds
+            print(f"  [WARNING] {name} search skipped: {e}")
+            continue
+        best_params[name] = params
+        print(f"  [OK] {name}: {params}")
+        print(f"       objective {report['objective']:.4f}, {report['latency_ms']:.3f} ms/row, "
+              f"{report['candidates']} candidates in {report['rounds']} rounds, {report['seconds']}s")
+    return best_params